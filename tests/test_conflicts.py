@@ -0,0 +1,46 @@
+"""Receiver-side conflict detection (detect_existing_conflicts)"""
+import tempfile
+import unittest
+from pathlib import Path
+
+import transfer
+
+
+def incoming(*filenames):
+    return [{'filename': name, 'size': 1} for name in filenames]
+
+
+class DetectExistingConflictsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.out = Path(self._tmp.name)
+
+    def detect(self, *filenames):
+        return transfer.detect_existing_conflicts(incoming(*filenames), str(self.out))
+
+    def test_no_conflicts_in_empty_directory(self):
+        self.assertEqual(self.detect('a.txt', 'd/e/f.txt', 'd/e/g.txt', 'd/h.txt'), [])
+
+    def test_existing_file_and_directory(self):
+        (self.out / 'a.txt').write_text('old')
+        (self.out / 'b.txt').mkdir()
+        self.assertEqual(self.detect('a.txt', 'b.txt', 'c.txt'), ['a.txt', 'b.txt/'])
+
+    def test_file_where_directory_is_needed(self):
+        (self.out / 'd').write_text('in the way')
+        # Several incoming files share the blocked parent; it is reported once
+        self.assertEqual(self.detect('d/e/f.txt', 'd/e/g.txt', 'd/h.txt'), [str(self.out / 'd')])
+
+    def test_nested_file_where_directory_is_needed(self):
+        (self.out / 'd').mkdir()
+        (self.out / 'd' / 'e').write_text('in the way')
+        self.assertEqual(self.detect('d/e/f.txt', 'd/g.txt'), [str(self.out / 'd' / 'e')])
+
+    def test_unsafe_names_are_skipped(self):
+        (self.out / 'a.txt').write_text('old')
+        self.assertEqual(self.detect('../a.txt', str(self.out / 'a.txt')), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
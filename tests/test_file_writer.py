@@ -0,0 +1,156 @@
+"""Receiver-side file writing: LazyFileWriterDict and FileWriter"""
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import transfer
+
+
+class WriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.out = Path(self._tmp.name)
+
+
+class WriteRangeTest(WriterTestCase):
+    CONTENTS = {'a.bin': b'abcde', 'b.bin': b'fgh', 'c.bin': b'ijkl'}
+
+    def writers(self, resume=None):
+        files_info, offset = [], 0
+        for name, data in self.CONTENTS.items():
+            files_info.append({'filename': name, 'size': len(data), 'offset': offset})
+            offset += len(data)
+        self.stream = b''.join(self.CONTENTS.values())
+        return transfer.LazyFileWriterDict(files_info, resume or {}, str(self.out), None)
+
+    def assert_files_written(self):
+        for name, data in self.CONTENTS.items():
+            self.assertEqual((self.out / name).read_bytes(), data)
+
+    def test_spans_cover_each_file_once(self):
+        writers = self.writers()
+        spans = [(writer.filename, begin, end) for writer, begin, end in writers.get_writers_for_range(3, 7)]
+        self.assertEqual(spans, [('a.bin', 0, 2), ('b.bin', 2, 5), ('c.bin', 5, 7)])
+
+    def test_whole_stream_in_one_run(self):
+        writers = self.writers()
+        writers.write_range(0, self.stream)
+        self.assert_files_written()
+
+    def test_runs_split_across_file_boundaries(self):
+        writers = self.writers()
+        for start, end in ((0, 4), (4, 7), (7, 12)):
+            writers.write_range(start, self.stream[start:end])
+        self.assert_files_written()
+
+    def test_resumed_file_skips_bytes_already_on_disk(self):
+        (self.out / 'a.bin.part').write_bytes(b'abc')
+        writers = self.writers(resume={'a.bin': 3})
+        writers.write_range(0, self.stream)
+        self.assert_files_written()
+        self.assertEqual(writers['a.bin'].get_hash(), hashlib.sha256(b'abcde').hexdigest())
+
+
+class CompleteFileTest(WriterTestCase):
+    def finish(self, data: bytes, overwrite_mode: bool = False) -> transfer.FileWriter:
+        writer = transfer.FileWriter('report.txt', len(data), 0, None, overwrite_mode, str(self.out))
+        writer.open_for_writing()
+        writer.write_chunk(data)
+        self.assertTrue(writer.is_complete)
+        self.assertFalse(writer.part_file.exists())
+        return writer
+
+    def test_free_name_is_kept(self):
+        self.finish(b'new')
+        self.assertEqual((self.out / 'report.txt').read_bytes(), b'new')
+
+    def test_name_collision_picks_next_free_suffix(self):
+        (self.out / 'report.txt').write_bytes(b'old')
+        (self.out / 'report_1.txt').write_bytes(b'older')
+        self.finish(b'new')
+        self.assertEqual((self.out / 'report.txt').read_bytes(), b'old')
+        self.assertEqual((self.out / 'report_1.txt').read_bytes(), b'older')
+        self.assertEqual((self.out / 'report_2.txt').read_bytes(), b'new')
+
+    def test_name_collision_without_hard_links(self):
+        (self.out / 'report.txt').write_bytes(b'old')
+        with mock.patch.object(transfer.os, 'link', side_effect=PermissionError):
+            self.finish(b'new')
+        self.assertEqual((self.out / 'report.txt').read_bytes(), b'old')
+        self.assertEqual((self.out / 'report_1.txt').read_bytes(), b'new')
+
+    def test_overwrite_mode_replaces_file_and_directory(self):
+        (self.out / 'report.txt').write_bytes(b'old')
+        self.finish(b'new', overwrite_mode=True)
+        self.assertEqual((self.out / 'report.txt').read_bytes(), b'new')
+
+        (self.out / 'report.txt').unlink()
+        (self.out / 'report.txt').mkdir()
+        self.finish(b'newer', overwrite_mode=True)
+        self.assertEqual((self.out / 'report.txt').read_bytes(), b'newer')
+
+
+
+class RecordedHashTest(WriterTestCase):
+    DATA = b'abcde'
+
+    def setUp(self):
+        super().setUp()
+        # First session: receive a.bin to completion and record its hash
+        manager = transfer.TransferLockManager(working_dir=str(self.out))
+        manager.create_lock_file('127.0.0.1', [{'filename': 'a.bin', 'size': len(self.DATA)}], len(self.DATA))
+        writer = transfer.FileWriter('a.bin', len(self.DATA), 0, manager, False, str(self.out))
+        writer.open_for_writing()
+        writer.write_chunk(self.DATA)
+        manager.flush_pending_updates()
+        manager._journal.close()
+
+    def resumed_writer(self) -> transfer.FileWriter:
+        manager = transfer.TransferLockManager(working_dir=str(self.out))
+        self.assertTrue(manager.load_existing_lock())
+        writer = transfer.FileWriter('a.bin', len(self.DATA), 0, manager, False, str(self.out))
+        writer.open_for_writing(resume_bytes=len(self.DATA))
+        self.assertTrue(writer.completed_earlier)
+        return writer
+
+    def test_untouched_file_reuses_recorded_hash(self):
+        self.assertEqual(self.resumed_writer().recorded_hash(), hashlib.sha256(self.DATA).hexdigest())
+
+    def test_modified_file_is_rehashed(self):
+        final = self.out / 'a.bin'
+        st = final.stat()
+        final.write_bytes(b'ABCDE')  # Same size, different content and mtime
+        os.utime(final, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(self.resumed_writer().recorded_hash())
+
+    def test_missing_file_is_rehashed(self):
+        (self.out / 'a.bin').unlink()
+        self.assertIsNone(self.resumed_writer().recorded_hash())
+
+
+class HashOpenFileTest(WriterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = os.urandom(3 * 1024 * 1024 + 17)  # Several read-buffer fills
+        self.path = self.out / 'data.bin'
+        self.path.write_bytes(self.data)
+
+    def hash(self) -> str:
+        with open(self.path, 'rb', buffering=0) as f:
+            return transfer.hash_open_file(f).hexdigest()
+
+    def test_matches_sha256(self):
+        self.assertEqual(self.hash(), hashlib.sha256(self.data).hexdigest())
+
+    def test_readinto_loop_without_file_digest(self):
+        # Python < 3.11: no hashlib.file_digest
+        with mock.patch.object(transfer, 'hashlib', mock.Mock(spec=[])):
+            self.assertEqual(self.hash(), hashlib.sha256(self.data).hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()
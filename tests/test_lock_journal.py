@@ -0,0 +1,74 @@
+"""Lock file snapshot + JSONL journal recovery (TransferLockManager)"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import transfer
+
+
+FILES = [{"filename": name, "size": 100} for name in ("a.bin", "b.bin", "c.bin")]
+
+
+class LockJournalTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = Path(self._tmp.name)
+
+    def _write_session(self):
+        """Snapshot the lock, then journal one update per file as a crash would leave it"""
+        manager = transfer.TransferLockManager(working_dir=str(self.dir))
+        manager.create_lock_file("127.0.0.1", FILES, total_size=300)
+        manager.update_file_status("a.bin", "completed", 100, "hash-a", force_save=True)
+        manager.update_file_status("b.bin", "in_progress", 40, "hash-b", force_save=True)
+        manager.update_file_status("c.bin", "in_progress", 70, "hash-c", force_save=True)
+        manager._journal.close()  # Process dies; nothing else is written
+        return manager._journal_path
+
+    def _load(self):
+        manager = transfer.TransferLockManager(working_dir=str(self.dir))
+        self.assertTrue(manager.load_existing_lock())
+        return manager.lock_data["files"]
+
+    def test_replays_journal_and_ignores_torn_tail(self):
+        journal_path = self._write_session()
+        data = journal_path.read_bytes()
+        # Cut the last record off mid-line, as an interrupted append would
+        journal_path.write_bytes(data[:data.rindex(b'\n', 0, len(data) - 1) + 15])
+
+        files = self._load()
+        self.assertEqual(files["a.bin"]["status"], "completed")
+        self.assertEqual(files["a.bin"]["transferred_bytes"], 100)
+        self.assertEqual(files["a.bin"]["partial_hash"], "hash-a")
+        self.assertEqual(files["b.bin"]["status"], "in_progress")
+        self.assertEqual(files["b.bin"]["transferred_bytes"], 40)
+        self.assertEqual(files["c.bin"]["status"], "pending")
+        self.assertEqual(files["c.bin"]["transferred_bytes"], 0)
+
+    def test_replay_is_compacted_into_snapshot(self):
+        journal_path = self._write_session()
+        self._load()
+
+        snapshot = json.loads((self.dir / transfer.TransferLockManager.LOCK_FILE_NAME).read_text())
+        self.assertEqual(snapshot["files"]["c.bin"]["transferred_bytes"], 70)
+        header, *deltas = journal_path.read_bytes().splitlines()
+        self.assertEqual(json.loads(header), {"generation": snapshot["generation"]})
+        self.assertEqual(deltas, [])
+
+    def test_ignores_journal_from_older_generation(self):
+        journal_path = self._write_session()
+        header, *deltas = journal_path.read_bytes().splitlines()
+        generation = json.loads(header)["generation"]
+        # Journal left behind by the previous snapshot (crash between rename and reset)
+        journal_path.write_bytes(b'\n'.join(
+            [json.dumps({"generation": generation - 1}).encode()] + deltas) + b'\n')
+
+        files = self._load()
+        for name in ("a.bin", "b.bin", "c.bin"):
+            self.assertEqual(files[name]["status"], "pending")
+            self.assertEqual(files[name]["transferred_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Progress display output (print_transfer_progress)"""
+import io
+import unittest
+from unittest import mock
+
+import transfer
+
+
+class FakeStdout:
+    """stdout stand-in backed by a descriptor that os.write() is patched for"""
+    encoding = 'utf-8'
+
+    def fileno(self):
+        return 99
+
+    def flush(self):
+        pass
+
+
+class PrintTransferProgressTest(unittest.TestCase):
+    def draw(self, write):
+        stderr = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with mock.patch.object(transfer.sys, 'stdout', FakeStdout()), \
+                mock.patch.object(transfer.sys, 'stderr', stderr), \
+                mock.patch.object(transfer.os, 'write', side_effect=write):
+            transfer.print_transfer_progress('a.bin', 2048, 50.0, '1.0 MB/s', '00:01', True,
+                                             current_file_bytes=1024)
+        return stderr.buffer.getvalue()
+
+    def expected_frame(self):
+        return ("\rTransferring: a.bin (1.0 KB/2.0 KB)\033[K\n"
+                "\rProgress: 50.0% | Speed: 1.0 MB/s | ETA: 00:01\033[K\n"
+                "\r\033[K").encode()
+
+    def test_short_writes_are_continued(self):
+        out = bytearray()
+
+        def write(fd, data):
+            out.extend(data[:7])
+            return len(data[:7])
+        self.assertEqual(self.draw(write), b'')
+        self.assertEqual(bytes(out), self.expected_frame())
+
+    def test_failure_mid_frame_sends_only_the_rest_to_stderr(self):
+        out = bytearray()
+
+        def write(fd, data):
+            if out:
+                raise BrokenPipeError
+            out.extend(data[:10])
+            return 10
+        rest = self.draw(write)
+        self.assertEqual(len(out), 10)
+        self.assertEqual(bytes(out) + rest, self.expected_frame())
+
+    def test_stdout_without_descriptor_uses_print(self):
+        buffer = io.StringIO()
+        with mock.patch.object(transfer.sys, 'stdout', buffer):
+            transfer.print_transfer_progress('a.bin', 2048, 50.0, '1.0 MB/s', '00:01', True,
+                                             current_file_bytes=1024)
+        self.assertEqual(buffer.getvalue().encode(), self.expected_frame())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,371 @@
+"""Wire protocol: frame layout, counter nonces, cipher negotiation and the retry stream"""
+import contextlib
+import hashlib
+import io
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import transfer
+
+
+def paired_crypto():
+    """Two SecureCrypto instances with a session established between them"""
+    sender, receiver = transfer.SecureCrypto(), transfer.SecureCrypto()
+    sender.derive_session_key(receiver.get_public_key_bytes(), "ocean-tiger",
+                              receiver.get_cipher_preference())
+    receiver.derive_session_key(sender.get_public_key_bytes(), "ocean-tiger",
+                                sender.get_cipher_preference())
+    return sender, receiver
+
+
+def run_in_thread(target, *args):
+    """Start target(*args) on a thread; join() re-raises anything it raised"""
+    errors = []
+
+    def run():
+        try:
+            target(*args)
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    def join():
+        thread.join(30)
+        if errors:
+            raise errors[0]
+    return join
+
+
+class TrickleSocket:
+    """Socket stand-in whose sendmsg() accepts only a few bytes per call"""
+
+    def __init__(self, step: int):
+        self.step = step
+        self.sent = bytearray()
+        self.calls = 0
+
+    def sendmsg(self, buffers):
+        self.calls += 1
+        taken = b''.join(bytes(buf) for buf in buffers)[:self.step]
+        self.sent += taken
+        return len(taken)
+
+    def sendall(self, data):
+        self.sent += data
+
+
+class FrameTest(unittest.TestCase):
+    def test_layout_with_trailer(self):
+        sock = TrickleSocket(step=1 << 20)
+        transfer.send_frame(sock, b'n' * 12, b'payload', trailer=transfer.END_MARKER)
+        self.assertEqual(bytes(sock.sent),
+                         b'\x00\x00\x00\x0c' + b'n' * 12 + b'\x00\x00\x00\x07' + b'payload'
+                         + transfer.END_MARKER)
+
+    @unittest.skipUnless(transfer.HAS_SENDMSG, "sendmsg() unavailable")
+    def test_partial_sendmsg_is_resumed(self):
+        payload = os.urandom(1000)
+        whole = TrickleSocket(step=1 << 20)
+        transfer.send_frame(whole, b'n' * 12, payload, trailer=transfer.END_MARKER)
+        for step in (1, 3, 7, 16, 999):
+            with self.subTest(step=step):
+                trickle = TrickleSocket(step)
+                transfer.send_frame(trickle, b'n' * 12, payload, trailer=transfer.END_MARKER)
+                self.assertEqual(trickle.sent, whole.sent)
+                self.assertGreater(trickle.calls, 1)
+
+    def test_round_trip_through_receive_pipeline(self):
+        sender_crypto, receiver_crypto = paired_crypto()
+        # Sizes straddle socket buffer sizes so reads split mid-frame
+        payloads = [os.urandom(size) for size in (1, 4096, 70000, transfer.CHUNK_SIZE, 3)]
+        trailing = b'after the end marker'
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+
+        def send():
+            *body, last = payloads
+            for payload in body:
+                nonce = sender_crypto.next_nonce()
+                transfer.send_frame(a, nonce, sender_crypto.encrypt(payload, nonce))
+            nonce = sender_crypto.next_nonce()
+            transfer.send_frame(a, nonce, sender_crypto.encrypt(last, nonce),
+                                trailer=transfer.END_MARKER)
+            a.sendall(trailing)
+        join = run_in_thread(send)
+
+        pipeline = transfer.ReceivePipeline(b, receiver_crypto)
+        try:
+            received = [bytes(plaintext) for _, plaintext in pipeline]
+            pipeline.finish()
+        finally:
+            pipeline.close()
+        join()
+
+        self.assertEqual(received, payloads)
+        # The reader stops exactly at the end marker
+        self.assertEqual(transfer.recv_all(b, len(trailing)), trailing)
+
+
+class CounterNonceTest(unittest.TestCase):
+    def setUp(self):
+        self.sender, self.receiver = paired_crypto()
+
+    def _seal(self, data: bytes):
+        nonce = self.sender.next_nonce()
+        return nonce, self.sender.encrypt(data, nonce)
+
+    def test_nonces_count_up_per_direction(self):
+        first, second = self.sender.next_nonce(), self.sender.next_nonce()
+        self.assertNotEqual(first, second)
+        self.assertEqual(first[:4], second[:4])
+        # The two directions use different prefixes, so nonces never collide
+        self.assertNotEqual(first[:4], self.receiver.next_nonce()[:4])
+
+    def test_in_order_frames_decrypt(self):
+        for i in range(3):
+            nonce, ciphertext = self._seal(b'frame %d' % i)
+            self.assertEqual(self.receiver.decrypt(ciphertext, nonce), b'frame %d' % i)
+
+    def test_rejects_replayed_nonce(self):
+        nonce, ciphertext = self._seal(b'once')
+        self.receiver.decrypt(ciphertext, nonce)
+        with self.assertRaises(ValueError):
+            self.receiver.decrypt(ciphertext, nonce)
+
+    def test_rejects_out_of_order_nonce(self):
+        early = self._seal(b'first')
+        late = self._seal(b'second')
+        self.assertEqual(self.receiver.decrypt(late[1], late[0]), b'second')
+        with self.assertRaises(ValueError):
+            self.receiver.decrypt(early[1], early[0])
+
+    def test_rejects_own_direction_nonce(self):
+        # A frame reflected back at its sender carries the sender's own prefix
+        nonce, ciphertext = self._seal(b'reflected')
+        with self.assertRaises(ValueError):
+            self.sender.decrypt(ciphertext, nonce)
+
+    def test_forged_frame_does_not_advance_counter(self):
+        nonce, ciphertext = self._seal(b'genuine')
+        forged_nonce = nonce[:4] + (10).to_bytes(8, 'big')
+        with self.assertRaises(transfer.InvalidTag):
+            self.receiver.decrypt(ciphertext, forged_nonce)
+        self.assertEqual(self.receiver.decrypt(ciphertext, nonce), b'genuine')
+
+
+class CipherNegotiationTest(unittest.TestCase):
+    TOKEN = "ocean-tiger"
+
+    @staticmethod
+    def _crypto(accelerated: bool):
+        crypto = transfer.SecureCrypto()
+        crypto.has_aes_acceleration = lambda: accelerated
+        return crypto
+
+    def _handshake(self, sender, receiver, preference_seen_by_sender=None):
+        """Derive both session keys; preference_seen_by_sender overrides the receiver's byte in transit"""
+        if preference_seen_by_sender is None:
+            preference_seen_by_sender = receiver.get_cipher_preference()
+        sender.derive_session_key(receiver.get_public_key_bytes(), self.TOKEN, preference_seen_by_sender)
+        receiver.derive_session_key(sender.get_public_key_bytes(), self.TOKEN,
+                                    sender.get_cipher_preference())
+
+    def assert_interoperate(self, sender, receiver):
+        self.assertEqual(sender.session_key, receiver.session_key)
+        nonce = sender.next_nonce()
+        self.assertEqual(receiver.decrypt(sender.encrypt(b'payload', nonce), nonce), b'payload')
+
+    def test_both_accelerated_use_aes_gcm(self):
+        sender, receiver = self._crypto(True), self._crypto(True)
+        self._handshake(sender, receiver)
+        self.assertEqual((sender.cipher_name, receiver.cipher_name), ('aes-256-gcm', 'aes-256-gcm'))
+        self.assertIsInstance(sender.cipher, transfer.AESGCM)
+        self.assert_interoperate(sender, receiver)
+
+    def test_any_unaccelerated_peer_uses_chacha20(self):
+        for sender_aes, receiver_aes in ((True, False), (False, True), (False, False)):
+            with self.subTest(sender=sender_aes, receiver=receiver_aes):
+                sender, receiver = self._crypto(sender_aes), self._crypto(receiver_aes)
+                self._handshake(sender, receiver)
+                self.assertEqual(sender.cipher_name, 'chacha20-poly1305')
+                self.assertEqual(receiver.cipher_name, 'chacha20-poly1305')
+                self.assert_interoperate(sender, receiver)
+
+    def test_downgraded_preference_derives_a_different_key(self):
+        # Both peers prefer AES-GCM, but the sender sees the receiver's byte
+        # rewritten to ChaCha20: the cipher choice is part of the HKDF info,
+        # so the two sides end up with unrelated keys instead of a weaker match
+        sender, receiver = self._crypto(True), self._crypto(True)
+        self._handshake(sender, receiver, preference_seen_by_sender=transfer.SecureCrypto.CIPHER_CHACHA20)
+        self.assertEqual(sender.cipher_name, 'chacha20-poly1305')
+        self.assertEqual(receiver.cipher_name, 'aes-256-gcm')
+        self.assertNotEqual(sender.session_key, receiver.session_key)
+        nonce = sender.next_nonce()
+        with self.assertRaises(transfer.InvalidTag):
+            receiver.decrypt(sender.encrypt(b'payload', nonce), nonce)
+
+    def test_cipher_choice_alone_changes_the_key(self):
+        # Same key pair and token, only the negotiated cipher differs
+        sender, receiver = self._crypto(True), self._crypto(True)
+        peer = receiver.get_public_key_bytes()
+        sender.derive_session_key(peer, self.TOKEN, transfer.SecureCrypto.CIPHER_AESGCM)
+        aes_key = sender.session_key
+        sender.derive_session_key(peer, self.TOKEN, transfer.SecureCrypto.CIPHER_CHACHA20)
+        self.assertNotEqual(aes_key, sender.session_key)
+
+
+class ResendSourceTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name, "source.bin")
+        self.data = os.urandom(10000)
+        self.path.write_bytes(self.data)
+        self.source = transfer.ResendSource()
+        self.addCleanup(self.source.close)
+
+    def test_reads_ranges_from_reused_buffer(self):
+        self.assertEqual(bytes(self.source.read(self.path, 100, 50)), self.data[100:150])
+        self.assertEqual(bytes(self.source.read(self.path, 9990, 50)), self.data[9990:])
+
+    def test_truncated_source_gives_short_read(self):
+        self.source.read(self.path, 0, 10)
+        with open(self.path, 'r+b') as f:
+            f.truncate(4000)  # Shrinks under the cached handle
+        self.assertEqual(bytes(self.source.read(self.path, 3000, 2000)), self.data[3000:4000])
+        self.assertEqual(len(self.source.read(self.path, 5000, 2000)), 0)
+
+    def test_seek_fallback_without_preadv(self):
+        with mock.patch.object(transfer, 'HAS_PREADV', False):
+            self.assertEqual(bytes(self.source.read(self.path, 9000, 2000)), self.data[9000:])
+
+
+class RecordingSocket:
+    """Socket stand-in that records setsockopt() calls and reads them back doubled, as Linux does"""
+
+    def __init__(self):
+        self.options = {}
+
+    def setsockopt(self, level, option, value):
+        self.options[option] = value
+
+    def getsockopt(self, level, option):
+        return self.options[option] * 2
+
+
+class SocketBufferTest(unittest.TestCase):
+    def tune(self, limits):
+        sock = RecordingSocket()
+        paths = {path: limits.get(name) for _, name, path in transfer._SOCKET_BUFFER_OPTIONS}
+        with mock.patch.object(transfer, 'read_socket_buffer_limit', side_effect=paths.get):
+            transfer.tune_socket_buffers(sock)
+        return sock.options
+
+    def test_sets_buffers_that_fit_under_the_limit(self):
+        size = transfer.SOCKET_BUFFER_SIZE
+        self.assertEqual(self.tune({'SO_SNDBUF': size, 'SO_RCVBUF': 2 * size}),
+                         {socket.SO_SNDBUF: size, socket.SO_RCVBUF: size})
+
+    def test_leaves_oversized_requests_to_autotuning(self):
+        size = transfer.SOCKET_BUFFER_SIZE
+        self.assertEqual(self.tune({'SO_SNDBUF': size - 1, 'SO_RCVBUF': size}),
+                         {socket.SO_RCVBUF: size})
+
+    def test_sets_buffers_when_limit_is_unknown(self):
+        self.assertEqual(set(self.tune({})), {socket.SO_SNDBUF, socket.SO_RCVBUF})
+
+
+class RetryStreamTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.src = Path(self._tmp.name, "src")
+        self.dst = Path(self._tmp.name, "dst")
+        self.src.mkdir()
+        self.dst.mkdir()
+        # Spans several frames, fits in one frame, and compresses well
+        self.contents = {
+            "big.bin": os.urandom(2 * transfer.CHUNK_SIZE + 5),
+            "small.bin": os.urandom(100),
+            "text.txt": b"hello world " * 5000,
+        }
+        for name, data in self.contents.items():
+            (self.src / name).write_bytes(data)
+
+    def _failed_writers(self):
+        """Writers left holding corrupt data by a first pass, reset as the receiver does"""
+        writers = []
+        for name, data in self.contents.items():
+            writer = transfer.FileWriter(name, len(data), 0, output_dir=str(self.dst))
+            writer.open_for_writing()
+            writer.write_chunk(bytes(len(data)))
+            writer.reset_for_retry()
+            writer.open_for_writing()
+            writers.append(writer)
+        return writers
+
+    def _retry_cycle(self, use_compression: bool):
+        sender_crypto, receiver_crypto = paired_crypto()
+        writers = self._failed_writers()
+        files = [(name, str(self.src / name), len(data)) for name, data in self.contents.items()]
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            join = run_in_thread(transfer.send_retry_stream, a, sender_crypto, files, use_compression)
+            hashes = transfer.receive_retry_stream(b, receiver_crypto, writers, use_compression)
+            join()
+
+        for writer in writers:
+            data = self.contents[writer.filename]
+            self.assertTrue(writer.is_complete)
+            self.assertEqual((self.dst / writer.filename).read_bytes(), data)
+            self.assertFalse(writer.part_file.exists())
+            self.assertEqual(hashes[writer.filename], hashlib.sha256(data).hexdigest())
+            self.assertEqual(writer.get_hash(), hashes[writer.filename])
+        # The whole stream, hashes frame included, was consumed
+        a.sendall(b'next')
+        self.assertEqual(transfer.recv_all(b, 4), b'next')
+
+    def test_retry_cycle(self):
+        self._retry_cycle(use_compression=False)
+
+    def test_retry_cycle_compressed(self):
+        self._retry_cycle(use_compression=True)
+
+    def test_shrunk_file_keeps_stream_aligned(self):
+        # A file that shrank after the first pass is zero-padded to its announced
+        # size (and so fails verification) without shifting the files after it
+        (self.src / "big.bin").write_bytes(self.contents["big.bin"][:1000])
+        sender_crypto, receiver_crypto = paired_crypto()
+        writers = self._failed_writers()
+        files = [(name, str(self.src / name), len(data)) for name, data in self.contents.items()]
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            join = run_in_thread(transfer.send_retry_stream, a, sender_crypto, files, False)
+            hashes = transfer.receive_retry_stream(b, receiver_crypto, writers, False)
+            join()
+
+        big, *rest = writers
+        self.assertTrue(big.is_complete)
+        self.assertEqual((self.dst / "big.bin").stat().st_size, len(self.contents["big.bin"]))
+        self.assertNotEqual(big.get_hash(), hashes["big.bin"])
+        for writer in rest:
+            self.assertEqual((self.dst / writer.filename).read_bytes(), self.contents[writer.filename])
+            self.assertEqual(writer.get_hash(), hashes[writer.filename])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Mapping stream positions back to files (build_stream_offsets and lookups)"""
+import unittest
+
+import transfer
+
+
+def metadata(*sizes):
+    """Per-file metadata with back-to-back offsets, as the sender builds it"""
+    files, offset = [], 0
+    for index, size in enumerate(sizes):
+        files.append({'filename': f'f{index}', 'size': size, 'offset': offset})
+        offset += size
+    return files
+
+
+class StreamOffsetsTest(unittest.TestCase):
+    def test_prefix_sums_end_with_total(self):
+        self.assertEqual(transfer.build_stream_offsets(metadata(10, 0, 5)), [0, 10, 10, 15])
+        self.assertEqual(transfer.build_stream_offsets([]), [0])
+
+    def test_resend_position_across_file_boundary(self):
+        files = metadata(10, 5, 7)
+        collected = [(f"/src/{info['filename']}", info['filename']) for info in files]
+        offsets = transfer.build_stream_offsets(files)
+        for position, expected in ((0, ('f0', 0)), (9, ('f0', 9)), (10, ('f1', 0)),
+                                   (14, ('f1', 4)), (15, ('f2', 0)), (21, ('f2', 6))):
+            with self.subTest(position=position):
+                (_, relative_path), offset = transfer.find_file_at_stream_position(
+                    collected, position, offsets)
+                self.assertEqual((relative_path, offset), expected)
+
+    def test_resend_position_skips_empty_files(self):
+        files = metadata(4, 0, 0, 3)
+        collected = [(f"/src/{info['filename']}", info['filename']) for info in files]
+        (_, relative_path), offset = transfer.find_file_at_stream_position(
+            collected, 4, transfer.build_stream_offsets(files))
+        self.assertEqual((relative_path, offset), ('f3', 0))
+
+    def test_resend_position_past_end(self):
+        files = metadata(4, 3)
+        collected = [(f"/src/{info['filename']}", info['filename']) for info in files]
+        self.assertEqual(transfer.find_file_at_stream_position(
+            collected, 7, transfer.build_stream_offsets(files)), (None, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,26 @@
 # VERSION: 1.0.1
 
 import argparse
+import bisect
+import concurrent.futures
+import ctypes
+import functools
 import hashlib
+import itertools
 import json
 import logging
+import math
 import os
+import platform
+import queue
+import re
 import secrets
 import select
 import shutil
 import signal
 import socket
+import stat
+import struct
 import subprocess
 import sys
 import threading
@@ -24,12 +35,18 @@ try:
     import resource
 except ImportError:
     resource = None  # Not available on Windows
+# Import orjson (optional, faster JSON) with fallback to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # blosc_extension is not directly importable, but blosc uses it internally
 # We'll catch the specific error type using a different approach
 
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import x25519
-from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import datetime
 import uuid
@@ -40,14 +57,29 @@ MAX_RETRY_ATTEMPTS = 3
 
 # Setup logging configuration
 logger = logging.getLogger('transfer')
-logger.setLevel(logging.DEBUG)  # Allow all levels, filter at handler
+# Filter at the logger, not just the handler: log_debug() calls on hot paths then
+# return from isEnabledFor() without building a LogRecord unless --debug is set
+logger.setLevel(logging.WARNING)
 
 # Create console handler that outputs to stderr
 console_handler = logging.StreamHandler(sys.stderr)
 console_handler.setLevel(logging.WARNING)  # Default: only WARNING and above
 
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the timestamp once per second instead of per record"""
+
+    _cached = (None, '')  # (epoch second, formatted timestamp)
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_text = self._cached
+        if second != cached_second:
+            cached_text = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            self._cached = (second, cached_text)
+        return cached_text
+
 # Create formatter with timestamp
-formatter = logging.Formatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+formatter = CachedTimeFormatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
 console_handler.setFormatter(formatter)
 
 # Add handler to logger
@@ -123,11 +155,33 @@ except AttributeError:
     pass  # SIGHUP might not exist on Windows
 
 # Configure Blosc for optimal performance with LZ4
-blosc.set_nthreads(4)  # Use 4 threads for compression
-blosc.set_releasegil(True)  # Release GIL during compression
+# Threads blosc splits each frame's blocks across (both compress and
+# decompress); one per core up to 8, past which 4MB frames stop scaling
+BLOSC_THREADS = max(1, min(8, blosc.detect_number_of_cores()))
+blosc.set_nthreads(BLOSC_THREADS)
+blosc.set_releasegil(True)  # Release GIL during compression and decompression
 # Use LZ4 compressor (fastest option) with level 1 for maximum speed
 BLOSC_COMPRESSOR = 'lz4'
 BLOSC_LEVEL = 1
+# File bytes have no fixed item size, so byte/bit shuffling only adds a transpose pass
+BLOSC_TYPESIZE = 1
+BLOSC_SHUFFLE = blosc.NOSHUFFLE
+# Denser codec the sender switches to while the network, not compression, is
+# the bottleneck; re-evaluated every CODEC_ADAPT_INTERVAL plaintext bytes.
+# Blosc frames name their codec, so the receiver needs no signalling
+BLOSC_DENSE_COMPRESSOR = 'zstd' if 'zstd' in blosc.compressor_list() else None
+BLOSC_DENSE_LEVEL = 3
+CODEC_ADAPT_INTERVAL = 16 * 1024 * 1024
+# Plaintext bytes per data frame. Small files are coalesced into frames of this
+# size so each AEAD/blosc call covers several megabytes instead of one tiny file
+CHUNK_SIZE = 4 * 1024 * 1024
+# Bytes per read() of a source file (unbuffered, so no extra copy through io)
+FILE_READ_SIZE = 1024 * 1024
+# Incompressible-data probe: sample size and count, distinct-byte cutoff and minimum useful ratio
+COMPRESS_PROBE_SIZE = 4096
+COMPRESS_PROBE_SAMPLES = 4
+COMPRESS_PROBE_MAX_UNIQUE = 230
+COMPRESS_PROBE_MAX_RATIO = 0.97
 
 # Virtual environment and cache directory patterns to exclude
 VENV_PATTERNS = [
@@ -138,9 +192,18 @@ VENV_PATTERNS = [
     'conda-env', '.conda',
     '.mypy_cache', '.coverage', '.cache'
 ]
+_VENV_PATTERNS_LC = frozenset(pattern.casefold() for pattern in VENV_PATTERNS)
+
+def is_venv_dir(dir_name: str) -> bool:
+    """Check if directory matches virtual environment patterns"""
+    return dir_name.casefold() in _VENV_PATTERNS_LC
 
+@functools.lru_cache(maxsize=None)
 def detect_tailscale_userspace_mode():
     """Detect if Tailscale is running in userspace proxy mode (containers)
+
+    Memoized: the interface layout doesn't change within one run, so the
+    netifaces / /proc / ifconfig probe happens at most once per process.
     
     Returns:
         bool: True if Tailscale is running in userspace mode (no TUN interface),
@@ -184,16 +247,624 @@ def detect_tailscale_userspace_mode():
             return False
 
 # Utility functions
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def _json_loads(data):
+    """Parse UTF-8 JSON from bytes-like data (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    # json.loads() takes bytes/bytearray as-is; only other buffers need a copy
+    return json.loads(data if isinstance(data, (bytes, bytearray)) else bytes(data))
+
+def _base_sha256():
+    """Build the pristine SHA-256 state that new_sha256() copies
+
+    Marked usedforsecurity=False (Python 3.9+) so OpenSSL builds running in
+    FIPS mode still hand out their accelerated (SHA-NI / ARMv8) digest for
+    these non-authentication hashes.
+    """
+    try:
+        return hashlib.sha256(usedforsecurity=False)
+    except TypeError:
+        return hashlib.sha256()  # Python < 3.9
+
+# OPTIMIZATION: One initialized context, cloned per file; copy() skips the
+# constructor's digest lookup and keyword handling
+_SHA256_BASE = _base_sha256()
+
+def new_sha256():
+    """Create a SHA-256 hasher for file integrity checks"""
+    return _SHA256_BASE.copy()
+
+# Threads for hashing many independent files at once (hashlib releases the GIL)
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+def hash_open_file(f):
+    """SHA-256 an open binary file from its current start
+
+    Read, not memory-mapped: a file truncated while it is being hashed just
+    ends early instead of raising SIGBUS on the vanished pages.
+
+    Args:
+        f: File object opened in binary mode (positioned at 0)
+
+    Returns:
+        SHA-256 hasher holding the digest state of the whole file
+    """
+    advise_sequential(f)
+    if hasattr(hashlib, 'file_digest'):
+        # Python 3.11+: hashes in C with a reusable buffer, GIL released
+        return hashlib.file_digest(f, new_sha256)
+    # Large unbuffered reads into one reusable buffer: few syscalls, no
+    # per-read allocation, and hashlib releases the GIL on big updates
+    hasher = new_sha256()
+    buffer = bytearray(1024 * 1024)
+    view = memoryview(buffer)
+    while True:
+        count = f.readinto(buffer)
+        if not count:
+            break
+        hasher.update(view[:count])
+    return hasher
+
+def calculate_file_hash(file_path) -> Optional[str]:
+    """Calculate SHA-256 hash of a file (None if it can't be read)"""
+    try:
+        with open(file_path, 'rb', buffering=0) as f:
+            return hash_open_file(f).hexdigest()
+    except OSError as e:
+        log_debug(f"Failed to hash file {file_path}: {e}")
+        return None
+
+def calculate_file_hashes(file_paths: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Hash many files concurrently
+
+    hashlib and file reads release the GIL, so a small thread pool hashes
+    independent files in parallel across cores.
+
+    Args:
+        file_paths: Dict mapping a name to the path to hash
+
+    Returns:
+        Dict mapping each name to its hex digest (None if the file couldn't be read)
+    """
+    if len(file_paths) < 2:
+        return {name: calculate_file_hash(path) for name, path in file_paths.items()}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        return dict(zip(file_paths, pool.map(calculate_file_hash, file_paths.values())))
+
+# Big-endian 4-byte length prefix used by every message on the wire
+_U32 = struct.Struct('>I')
+
 def recv_all(socket, n):
-    """Receive exactly n bytes from socket"""
-    data = b''
-    while len(data) < n:
-        packet = socket.recv(n - len(data))
-        if not packet:
-            raise ConnectionError("Socket connection broken")
-        data += packet
+    """Receive exactly n bytes from socket
+
+    Reads straight into one preallocated buffer, so large frames aren't
+    re-copied on every partial read. Returns a bytearray, which the AEAD,
+    json and _U32.unpack all accept without conversion.
+    """
+    data = bytearray(n)
+    recv_into_all(socket, memoryview(data))
     return data
 
+def recv_into_all(socket, view):
+    """Fill a caller-owned writable memoryview completely from socket
+
+    Lets hot loops receive into buffers they recycle instead of allocating
+    a new one per message.
+    """
+    n = len(view)
+    received = 0
+    while received < n:
+        count = socket.recv_into(view[received:], n - received)
+        if not count:
+            raise ConnectionError("Socket connection broken")
+        received += count
+
+# Socket buffer sizes: defaults (~200KB on Linux) cap throughput well below the
+# bandwidth-delay product of fast links; Tailscale's userspace proxy adds another hop
+SOCKET_BUFFER_SIZE = 8 * 1024 * 1024
+SOCKET_BUFFER_SIZE_USERSPACE = 16 * 1024 * 1024
+
+# Each buffer option with the sysctl that caps explicit requests for it (Linux)
+_SOCKET_BUFFER_OPTIONS = (
+    (socket.SO_SNDBUF, 'SO_SNDBUF', '/proc/sys/net/core/wmem_max'),
+    (socket.SO_RCVBUF, 'SO_RCVBUF', '/proc/sys/net/core/rmem_max'),
+)
+
+def read_socket_buffer_limit(path: str) -> Optional[int]:
+    """Read a net.core.*mem_max sysctl; None where it doesn't exist or can't be read"""
+    try:
+        with open(path, 'r') as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+def tune_socket_buffers(sock, userspace_mode: bool = False):
+    """Enlarge a TCP socket's send/receive buffers
+
+    Must be called before listen()/connect() so the larger receive window
+    is used in window-scale negotiation; accepted sockets inherit it.
+    Setting SO_SNDBUF/SO_RCVBUF turns off the kernel's buffer autotuning,
+    so a buffer is only set when the request fits under its
+    net.core.wmem_max/rmem_max limit. Otherwise the kernel would clamp it
+    to that limit, usually below what autotuning reaches, so the option
+    is left unset and the skip is logged.
+    """
+    size = SOCKET_BUFFER_SIZE_USERSPACE if userspace_mode else SOCKET_BUFFER_SIZE
+    for option, name, limit_path in _SOCKET_BUFFER_OPTIONS:
+        limit = read_socket_buffer_limit(limit_path)
+        if limit is not None and size > limit:
+            log_debug(f"Socket buffers: not setting {name}; requested {size} exceeds "
+                      f"{limit_path} ({limit}), leaving kernel autotuning on")
+            continue
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+        except OSError as e:
+            log_debug(f"Could not set socket buffer option {name}: {e}")
+            continue
+        try:
+            granted = sock.getsockopt(socket.SOL_SOCKET, option)
+        except OSError:
+            continue
+        # Linux doubles the request for bookkeeping overhead and reports that value
+        if sys.platform.startswith('linux'):
+            granted //= 2
+        log_debug(f"Socket buffers: requested {name}={size}, got {granted}")
+        if granted < size:
+            log_debug(f"Warning: {name} clamped by the kernel to {granted} bytes; "
+                      f"raise net.core.wmem_max/rmem_max for full throughput on long links")
+
+# Unsent bytes the sender lets queue beyond the congestion window (Linux): keeps
+# the pipe full while stopping multi-MB backlogs from inflating RESEND latency
+SOCKET_NOTSENT_LOWAT = 256 * 1024
+
+def tune_connected_socket(sock, sending: bool):
+    """Set per-connection TCP options once a socket is connected
+
+    Disables Nagle everywhere. On Linux the sender also caps its unsent
+    backlog (TCP_NOTSENT_LOWAT) and the receiver asks for immediate ACKs
+    (TCP_QUICKACK) so the sender's window opens without delayed-ACK stalls.
+    Options the platform lacks or refuses are skipped.
+
+    Args:
+        sock: Connected TCP socket
+        sending: True on the side that streams file data
+    """
+    options = [(socket.TCP_NODELAY, 1)]
+    if sending and hasattr(socket, 'TCP_NOTSENT_LOWAT'):
+        options.append((socket.TCP_NOTSENT_LOWAT, SOCKET_NOTSENT_LOWAT))
+    if not sending and hasattr(socket, 'TCP_QUICKACK'):
+        options.append((socket.TCP_QUICKACK, 1))
+    for option, value in options:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
+        except OSError as e:
+            log_debug(f"Could not set TCP option {option}: {e}")
+
+# Teardown drains the peer's in-flight data for at most this long (per recv / overall)
+SOCKET_DRAIN_TIMEOUT = 0.5
+SOCKET_DRAIN_LIMIT = 2.0
+
+def close_socket_gracefully(sock):
+    """Half-close, drain and close a connected socket
+
+    Shutting down both directions while unread data is queued makes Linux
+    send an RST, so the peer sees "Connection reset" instead of a clean
+    end of stream. Sending FIN first and reading until the peer closes
+    (bounded by SOCKET_DRAIN_LIMIT) lets both sides finish normally.
+    """
+    try:
+        sock.shutdown(socket.SHUT_WR)
+        sock.settimeout(SOCKET_DRAIN_TIMEOUT)
+        deadline = time.monotonic() + SOCKET_DRAIN_LIMIT
+        while time.monotonic() < deadline and sock.recv(65536):
+            pass
+    except (OSError, AttributeError):
+        pass  # Socket may already be closed or reset
+    sock.close()
+
+def abort_socket(sock):
+    """Close a socket immediately with an RST, discarding queued data
+
+    For fatal protocol errors where nothing more can usefully be exchanged.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    except OSError:
+        pass
+    sock.close()
+
+# sendmsg() (scatter-gather) is unavailable on Windows
+HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+HAS_FADVISE = hasattr(os, 'posix_fadvise')  # Linux/BSD page-cache hints
+HAS_PREADV = hasattr(os, 'preadv')  # Positional readinto; not on Windows
+
+def advise_sequential(f):
+    """Hint the kernel that f is accessed front to back (bigger readahead)
+
+    A no-op where posix_fadvise() is unavailable or refused.
+    """
+    if HAS_FADVISE:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+# fallocate(2) with FALLOC_FL_KEEP_SIZE (Linux only): reserves a file's blocks
+# up front without changing st_size, which resume detection compares against
+FALLOC_FL_KEEP_SIZE = 0x01
+_fallocate = None
+if sys.platform.startswith('linux'):
+    try:
+        _fallocate = ctypes.CDLL(None, use_errno=True).fallocate
+        _fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        _fallocate.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _fallocate = None
+
+def preallocate(f, offset: int, length: int):
+    """Reserve disk blocks for f[offset:offset + length] ahead of writing them
+
+    Lets the filesystem lay the file out in a few large extents instead of
+    growing its block map on every append. Best effort: a no-op off Linux
+    or on filesystems without fallocate support.
+    """
+    if _fallocate is None or length <= 0:
+        return
+    if _fallocate(f.fileno(), FALLOC_FL_KEEP_SIZE, offset, length) != 0:
+        log_debug(f"fallocate skipped: {os.strerror(ctypes.get_errno())}")
+
+# sync_file_range(2) with SYNC_FILE_RANGE_WRITE (Linux only): starts writeback of
+# a file range without waiting for it, so the pages are clean by the time they
+# are advised away
+SYNC_FILE_RANGE_WRITE = 0x02
+_sync_file_range = None
+if sys.platform.startswith('linux'):
+    try:
+        _sync_file_range = ctypes.CDLL(None, use_errno=True).sync_file_range
+        _sync_file_range.argtypes = [ctypes.c_int, ctypes.c_int64, ctypes.c_int64, ctypes.c_uint]
+        _sync_file_range.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _sync_file_range = None
+
+def start_writeback(f, offset: int, length: int):
+    """Ask the kernel to start writing f[offset:offset + length] to disk
+
+    Returns immediately. Best effort: a no-op off Linux or where the
+    filesystem refuses.
+    """
+    if _sync_file_range is None or length <= 0:
+        return
+    if _sync_file_range(f.fileno(), offset, length, SYNC_FILE_RANGE_WRITE) != 0:
+        log_debug(f"sync_file_range skipped: {os.strerror(ctypes.get_errno())}")
+
+def make_readable_check(sock):
+    """Build a non-blocking "has the peer sent anything?" check for sock
+
+    With poll() available the socket is registered once, so each check is a
+    single zero-timeout poll() with no per-call fd list to build; select()
+    is the fallback on Windows.
+
+    Returns:
+        Zero-argument callable returning True if sock is readable
+    """
+    if hasattr(select, 'poll'):
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        return lambda: bool(poller.poll(0))
+    return lambda: bool(select.select([sock], [], [], 0)[0])
+
+# Zero nonce length that terminates a stream of frames
+END_MARKER = b'\x00\x00\x00\x00'
+
+def send_frame(client_socket, nonce: bytes, payload: bytes, trailer: bytes = b''):
+    """Send one length-prefixed (nonce, ciphertext) frame in a single syscall
+
+    Uses sendmsg() so the kernel gathers header and body straight from their
+    own buffers, avoiding both four separate sends and a concatenation copy
+    of the (up to 4MB) ciphertext. Falls back to one joined sendall() where
+    sendmsg() is not available.
+
+    Args:
+        trailer: Raw bytes sent right after the frame in the same call
+            (e.g. END_MARKER after a stream's last frame)
+    """
+    buffers = [_U32.pack(len(nonce)), nonce, _U32.pack(len(payload)), payload]
+    if trailer:
+        buffers.append(trailer)
+    if not HAS_SENDMSG:
+        client_socket.sendall(b''.join(buffers))
+        return
+
+    views = [memoryview(buf) for buf in buffers]
+    while views:
+        sent = client_socket.sendmsg(views)
+        # Drop fully sent buffers and advance into a partially sent one
+        while views and sent >= len(views[0]):
+            sent -= len(views[0])
+            views.pop(0)
+        if sent:
+            views[0] = views[0][sent:]
+
+# Frames buffered between receive pipeline stages (bounds memory to a few MB)
+RECEIVE_PIPELINE_DEPTH = 4
+
+class ReceivePipeline:
+    """Reads, decrypts and (optionally) decompresses data frames on background threads
+
+    A reader thread pulls (nonce, ciphertext) frames off the socket, a
+    decrypt thread authenticates them and, for compressed streams, a
+    decompress thread expands them, each handing off through a bounded
+    queue, so network reads, decryption, decompression and the caller's
+    writes all overlap. Both blosc and the AEAD release the GIL while they
+    work. The reader stops after consuming the end marker, leaving the
+    socket positioned for the completion/retry exchange. Errors raised on
+    any stage are re-raised from iteration in the caller's thread.
+    """
+
+    _END = object()
+
+    def __init__(self, client_socket, crypto, depth: int = RECEIVE_PIPELINE_DEPTH,
+                 compressed_size: Optional[int] = None):
+        """
+        Args:
+            client_socket: Connected socket positioned at the first data frame
+            crypto: SecureCrypto with the session key established
+            depth: Frames buffered between stages
+            compressed_size: For compressed streams, the decompressed length of
+                the data frames; those are yielded decompressed and any frames
+                after them (the hashes) as decrypted. None leaves every frame
+                as decrypted.
+        """
+        self._socket = client_socket
+        self._crypto = crypto
+        self._frames = queue.Queue(maxsize=depth)
+        self._plaintexts = queue.Queue(maxsize=depth)
+        # Ciphertext buffers the decrypt stage is done with, recycled by the reader
+        self._free_buffers = queue.SimpleQueue()
+        self._finished = False
+        self._threads = [
+            threading.Thread(target=self._read_frames, daemon=True),
+            threading.Thread(target=self._decrypt_frames, daemon=True),
+        ]
+        self._decrypted = self._plaintexts
+        if compressed_size is not None:
+            self._decrypted = queue.Queue(maxsize=depth)
+            self._compressed_size = compressed_size
+            # One output buffer per frame that can be alive at once: queued
+            # (depth), being decompressed (1) and held by the caller (1)
+            self._decompress_buffers = [DecompressBuffer() for _ in range(depth + 2)]
+            self._threads.append(threading.Thread(target=self._decompress_frames, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def _read_frames(self):
+        try:
+            # OPTIMIZATION: Two reads per frame instead of four. The nonce is read
+            # together with the ciphertext length, and each ciphertext together
+            # with the next frame's 4-byte nonce length (or the 4-byte end
+            # marker), so the reader never consumes bytes past the end marker
+            nonce_len = _U32.unpack(recv_all(self._socket, 4))[0]
+            while nonce_len:
+                header = recv_all(self._socket, nonce_len + 4)
+                nonce = bytes(header[:nonce_len])
+                ciphertext_len = _U32.unpack_from(header, nonce_len)[0]
+                buffer = self._take_buffer(ciphertext_len + 4)
+                body = memoryview(buffer)[:ciphertext_len + 4]
+                recv_into_all(self._socket, body)
+                nonce_len = _U32.unpack_from(body, ciphertext_len)[0]
+                self._frames.put((nonce, buffer, body[:ciphertext_len]))
+        except Exception as e:
+            self._frames.put(e)
+            return
+        self._frames.put(self._END)
+
+    def _take_buffer(self, size: int) -> bytearray:
+        """Get a recycled receive buffer holding at least size bytes"""
+        try:
+            buffer = self._free_buffers.get_nowait()
+        except queue.Empty:
+            return bytearray(size)
+        # Frames vary in size (compressed, final partial): regrow undersized ones
+        return buffer if len(buffer) >= size else bytearray(size)
+
+    def _decrypt_frames(self):
+        while True:
+            item = self._frames.get()
+            if item is self._END or isinstance(item, Exception):
+                self._decrypted.put(item)
+                return
+            nonce, buffer, ciphertext = item
+            try:
+                plaintext = self._crypto.decrypt(ciphertext, nonce)
+            except Exception as e:
+                self._decrypted.put(e)
+                return
+            # The plaintext is a new object, so the ciphertext buffer is free again
+            self._free_buffers.put(buffer)
+            self._decrypted.put((len(ciphertext), plaintext))
+
+    def _decompress_frames(self):
+        position = 0
+        buffers = itertools.cycle(self._decompress_buffers)
+        while True:
+            item = self._decrypted.get()
+            if item is self._END or isinstance(item, Exception):
+                self._plaintexts.put(item)
+                return
+            if position < self._compressed_size:
+                ciphertext_len, plaintext = item
+                try:
+                    chunk = next(buffers).decompress(plaintext)
+                except Exception as e:
+                    self._plaintexts.put(e)
+                    return
+                position += len(chunk)
+                item = (ciphertext_len, chunk)
+            self._plaintexts.put(item)
+
+    def __iter__(self):
+        """Yield (ciphertext_length, plaintext) for each frame until the end marker
+
+        Decompressed frames are views into recycled buffers, valid until the
+        next iteration.
+        """
+        while not self._finished:
+            item = self._plaintexts.get()
+            if item is self._END:
+                self._finished = True
+                return
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            yield item
+
+    def finish(self):
+        """Discard any frames still in flight, consuming the end marker"""
+        while not self._finished:
+            item = self._plaintexts.get()
+            if item is self._END or isinstance(item, Exception):
+                self._finished = True
+        for thread in self._threads:
+            thread.join()
+
+    def close(self):
+        """Stop every stage and wait for it to exit; safe to call more than once
+
+        After finish() the stages have already stopped. Otherwise (the caller
+        bailed out mid-stream) the socket's read side is shut down so a reader
+        blocked in recv() returns, and queued frames are discarded so no stage
+        stays blocked on a full queue.
+        """
+        if not any(thread.is_alive() for thread in self._threads):
+            return
+        self._finished = True
+        try:
+            self._socket.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+        stage_queues = {self._frames, self._decrypted, self._plaintexts}  # _decrypted may be _plaintexts
+        for thread in self._threads:
+            while thread.is_alive():
+                for stage_queue in stage_queues:
+                    try:
+                        while True:
+                            stage_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                thread.join(0.05)
+
+# Frames buffered between send pipeline stages (bounds memory to a few MB)
+SEND_PIPELINE_DEPTH = 4
+
+class SendPipeline:
+    """Compresses, encrypts and sends data frames on background threads
+
+    The caller reads and hashes file data and submit()s plaintext chunks; a
+    compress thread (only when compression is on) and a send thread take it
+    from there through bounded queues, so disk reads, hashing, compression,
+    encryption and socket writes overlap. Nonces are drawn, and frames
+    written, only on the send thread, so they stay in order. on_sent is
+    called there after each frame, which also makes it the place to answer
+    RESEND requests. Errors raised on either thread are re-raised from the
+    next submit() or from finish().
+    """
+
+    _END = object()
+
+    def __init__(self, client_socket, crypto, use_compression: bool, on_sent,
+                 depth: int = SEND_PIPELINE_DEPTH):
+        self._socket = client_socket
+        self._crypto = crypto
+        self._on_sent = on_sent
+        self._plaintexts = queue.Queue(maxsize=depth)
+        self._payloads = queue.Queue(maxsize=depth) if use_compression else self._plaintexts
+        self._error = None
+        self._send_time = 0.0  # Seconds the send thread has spent in send_frame()
+        self._threads = [threading.Thread(target=self._send_frames, daemon=True)]
+        if use_compression:
+            self._threads.append(threading.Thread(target=self._compress_frames, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def _compress_frames(self):
+        cname, clevel = BLOSC_COMPRESSOR, BLOSC_LEVEL
+        window_bytes = 0
+        compress_time = 0.0
+        send_time_mark = 0.0
+        while True:
+            item = self._plaintexts.get()
+            if item is self._END:
+                self._payloads.put(item)
+                return
+            if self._error is not None:
+                continue  # Keep draining so the caller never blocks on a full queue
+            plain_len, data = item
+            try:
+                # clevel 0 stores incompressible frames as-is; the receiver
+                # decompresses them like any other blosc frame
+                level = clevel if _looks_compressible(data) else 0
+                started = time.perf_counter()
+                payload = blosc.compress(data, typesize=BLOSC_TYPESIZE, clevel=level,
+                                         shuffle=BLOSC_SHUFFLE, cname=cname)
+                compress_time += time.perf_counter() - started
+            except Exception as e:
+                self._error = e
+                continue
+            self._payloads.put((plain_len, payload))
+
+            # Use the denser codec while sends take well over twice as long as
+            # compressing, and drop back once compression becomes the bottleneck
+            window_bytes += plain_len
+            if window_bytes >= CODEC_ADAPT_INTERVAL and BLOSC_DENSE_COMPRESSOR:
+                send_time = self._send_time - send_time_mark
+                if cname == BLOSC_COMPRESSOR and send_time > 2 * compress_time:
+                    cname, clevel = BLOSC_DENSE_COMPRESSOR, BLOSC_DENSE_LEVEL
+                    log_debug(f"Sender: switching to {cname} (send {send_time:.2f}s, compress {compress_time:.2f}s)")
+                elif cname != BLOSC_COMPRESSOR and compress_time > send_time:
+                    cname, clevel = BLOSC_COMPRESSOR, BLOSC_LEVEL
+                    log_debug(f"Sender: switching to {cname} (send {send_time:.2f}s, compress {compress_time:.2f}s)")
+                window_bytes = 0
+                compress_time = 0.0
+                send_time_mark = self._send_time
+
+    def _send_frames(self):
+        while True:
+            item = self._payloads.get()
+            if item is self._END:
+                return
+            if self._error is not None:
+                continue
+            plain_len, payload = item
+            try:
+                nonce = self._crypto.next_nonce()
+                ciphertext = self._crypto.encrypt(payload, nonce)
+                started = time.perf_counter()
+                send_frame(self._socket, nonce, ciphertext)
+                self._send_time += time.perf_counter() - started
+                self._on_sent(plain_len, len(ciphertext))
+            except Exception as e:
+                self._error = e
+
+    def submit(self, data: bytes):
+        """Queue one plaintext chunk to be sent as a data frame"""
+        if self._error is not None:
+            raise self._error
+        self._plaintexts.put((len(data), data))
+
+    def finish(self):
+        """Wait until every submitted chunk has been sent"""
+        self._plaintexts.put(self._END)
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+
 def expand_glob_patterns(file_patterns: List[str]) -> List[str]:
     """Expand glob patterns to actual file/directory paths.
 
@@ -262,51 +933,65 @@ def validate_files(file_paths: List[str]) -> List[Path]:
 
     return validated_files
 
-def collect_files_recursive(file_paths: List[Path]) -> Tuple[List[Tuple[Path, str]], List[str]]:
+def collect_files_recursive(file_paths: List[Path], exclude_venv: bool = False) -> Tuple[List[Tuple[Path, str, int]], List[str]]:
     """Collect all files recursively from directories and detect virtual environment directories
     
     Args:
         file_paths: List of file/directory paths to process
+        exclude_venv: Skip the contents of virtual env/cache directories
     
     Returns:
         Tuple of (files_list, detected_venv_dirs_list)
-        - files_list: List of (absolute_path, relative_path) tuples  
+        - files_list: List of (absolute_path, relative_path, size_in_bytes) tuples,
+          the size taken from the directory scan's stat
         - detected_venv_dirs_list: List of virtual env/cache directories found
     """
     collected_files = []
     detected_venv_dirs = []
     
-    def is_venv_dir(dir_name: str) -> bool:
-        """Check if directory matches virtual environment patterns"""
-        return dir_name.lower() in [pattern.lower() for pattern in VENV_PATTERNS]
-    
-    def collect_from_directory(base_path: Path, current_path: Path, exclude_venv: bool = False):
-        """Recursively collect files from directory"""
-        try:
-            for item in current_path.iterdir():
-                if item.is_file():
-                    # Calculate relative path from the base directory being sent
-                    relative_path = item.relative_to(base_path.parent)
-                    # Normalize to POSIX path (forward slashes) for cross-platform compatibility
-                    collected_files.append((item, relative_path.as_posix()))
-                elif item.is_dir():
-                    # Check if this directory matches venv patterns
-                    if is_venv_dir(item.name):
-                        detected_venv_dirs.append(item.name)
-                        # Only skip recursion if we're excluding venv dirs
-                        if not exclude_venv:
-                            collect_from_directory(base_path, item, exclude_venv)
-                    else:
-                        # Recursively process subdirectory
-                        collect_from_directory(base_path, item, exclude_venv)
-        except PermissionError:
-            log_debug(f"Permission denied accessing {current_path}")
+    def collect_from_directory(base_prefix_len: int, root_path: str):
+        """Collect files under root_path, walking with an explicit stack"""
+        pending = [root_path]
+        while pending:
+            current_path = pending.pop()
+            subdirs = []
+            try:
+                # DirEntry caches the d_type from the directory listing, so regular
+                # entries need no extra stat() per is_file()/is_dir() check
+                with os.scandir(current_path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            # Relative path from the base directory being sent, by slicing off its parent
+                            relative_path = entry.path[base_prefix_len:]
+                            # Normalize to POSIX path (forward slashes) for cross-platform compatibility
+                            if os.sep != '/':
+                                relative_path = relative_path.replace(os.sep, '/')
+                            try:
+                                size = entry.stat().st_size
+                            except OSError as e:
+                                log_debug(f"Skipping {entry.path}: {e}")
+                                continue
+                            collected_files.append((Path(entry.path), relative_path, size))
+                        elif entry.is_dir():
+                            # Check if this directory matches venv patterns
+                            if is_venv_dir(entry.name):
+                                detected_venv_dirs.append(entry.name)
+                                # Only skip recursion if we're excluding venv dirs
+                                if exclude_venv:
+                                    continue
+                            subdirs.append(entry.path)
+            except PermissionError:
+                log_debug(f"Permission denied accessing {current_path}")
+            # Reversed so subdirectories are still visited in listing order
+            pending.extend(reversed(subdirs))
     
     for path in file_paths:
         if path.is_file():
-            collected_files.append((path, path.name))
+            collected_files.append((path, path.name, path.stat().st_size))
         elif path.is_dir():
-            collect_from_directory(path, path)
+            # Parent with a trailing separator; works for '/' and '.' parents alike
+            base_prefix = os.path.join(str(path.parent), '') if str(path.parent) != '.' else ''
+            collect_from_directory(len(base_prefix), os.path.join(base_prefix, path.name))
         else:
             log_debug(f"Skipping {path} (not a regular file or directory)")
     
@@ -376,6 +1061,15 @@ def detect_existing_conflicts(files_info: List[Dict], output_dir: str = '.') ->
     """
     conflicts = []
     output_path = Path(output_dir)
+    # Distinct parent directories (relative, '/'-separated) of all incoming files
+    parent_dirs = set()
+
+    def path_mode(path: Path) -> Optional[int]:
+        """Return st_mode for path (following symlinks), or None if it doesn't exist"""
+        try:
+            return os.stat(path).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            return None
 
     for file_info in files_info:
         filename = file_info['filename']
@@ -387,22 +1081,31 @@ def detect_existing_conflicts(files_info: List[Dict], output_dir: str = '.') ->
         final_path = output_path / filename
         
         # Check for direct file conflict
-        if final_path.exists():
+        mode = path_mode(final_path)
+        if mode is not None:
             # Add appropriate suffix for display
-            if final_path.is_dir():
+            if stat.S_ISDIR(mode):
                 conflicts.append(f"{filename}/")
             else:
                 conflicts.append(filename)
-        
-        # Check for directory conflicts (if incoming file would create directories)
-        # that conflict with existing files
-        parent = final_path.parent
-        while parent != Path('.') and str(parent) != '.':
-            if parent.exists() and parent.is_file():
+
+        parent_dirs.add(filename.rpartition('/')[0])
+    
+    # Check for directory conflicts (if incoming files would create directories)
+    # that conflict with existing files. Each distinct parent is walked up towards
+    # output_dir once, stopping at an ancestor an earlier walk already visited,
+    # so stats scale with the number of directories rather than files x depth.
+    checked_dirs = set()
+    for relative_dir in sorted(parent_dirs):
+        while relative_dir and relative_dir not in checked_dirs:
+            checked_dirs.add(relative_dir)
+            parent = output_path / relative_dir
+            mode = path_mode(parent)
+            if mode is not None and stat.S_ISREG(mode):
                 # A file exists where we need to create a directory
                 conflicts.append(str(parent))
                 break
-            parent = parent.parent
+            relative_dir = relative_dir.rpartition('/')[0]
     
     # Remove duplicates while preserving order
     seen = set()
@@ -464,13 +1167,15 @@ def calculate_eta(remaining_bytes: int, current_speed: float) -> int:
         return 0
     return int(remaining_bytes / current_speed)
 
-def calculate_smoothed_speed(recent_speeds: list, delta_bytes: int, delta_time: float) -> float:
-    """Calculate smoothed speed using moving average of recent measurements
+def calculate_smoothed_speed(previous_speed: Optional[float], delta_bytes: int, delta_time: float,
+                             tau: float = 3.0) -> float:
+    """Calculate smoothed speed as a time-aware exponentially weighted moving average
 
     Args:
-        recent_speeds: List of recent speed measurements
+        previous_speed: Smoothed speed from the previous update (None on the first one)
         delta_bytes: Bytes transferred since last measurement
         delta_time: Time elapsed since last measurement
+        tau: Smoothing time constant in seconds (half-life is tau * ln 2)
 
     Returns:
         Smoothed speed in bytes/second
@@ -481,24 +1186,12 @@ def calculate_smoothed_speed(recent_speeds: list, delta_bytes: int, delta_time:
     else:
         current_speed = delta_bytes / delta_time
 
-    # Add to recent speeds list (keep last 15 measurements)
-    recent_speeds.append(current_speed)
-    if len(recent_speeds) > 15:
-        recent_speeds.pop(0)
-
-    # Use weighted average favoring recent measurements
-    if len(recent_speeds) == 1:
+    if previous_speed is None:
         return current_speed
 
-    # Weight recent speeds more heavily (exponential weighting)
-    total_weight = 0
-    weighted_sum = 0
-    for i, speed in enumerate(recent_speeds):
-        weight = (i + 1) ** 1.5  # Exponential weighting favoring recent values
-        weighted_sum += speed * weight
-        total_weight += weight
-
-    return weighted_sum / total_weight if total_weight > 0 else current_speed
+    # Weight by elapsed time so irregular tick intervals decay consistently
+    alpha = 1.0 - math.exp(-max(delta_time, 0.0) / tau)
+    return previous_speed + alpha * (current_speed - previous_speed)
 
 def calculate_smoothed_eta(remaining_bytes: int, smoothed_speed: float, previous_eta: int, progress_percent: float) -> int:
     """Calculate ETA with smoothing to prevent dramatic increases"""
@@ -531,7 +1224,11 @@ def calculate_smoothed_eta(remaining_bytes: int, smoothed_speed: float, previous
     return raw_eta
 
 def progress_update_thread(state: dict, stop_event: threading.Event, stall_callback=None):
-    """Background thread to continuously update progress display every 200ms
+    """Background thread to update the progress display
+
+    Redraws at most every 200ms. When the state carries a 'progress_cv'
+    Condition, the thread sleeps until notify_progress() reports new data,
+    falling back to one redraw per second while the transfer is idle.
 
     Args:
         state: Shared state dictionary with keys:
@@ -542,12 +1239,15 @@ def progress_update_thread(state: dict, stop_event: threading.Event, stall_callb
             - 'action': "Sending" or "Receiving"
             - 'start_time': Transfer start timestamp
             - 'stream_position': Current stream position (for stall recovery)
+            - 'progress_cv': Optional threading.Condition signalled by notify_progress()
         stop_event: Event to signal thread to stop
         stall_callback: Optional callback function(stream_position) called when stall detected
     """
-    PROGRESS_UPDATE_INTERVAL = 0.2  # Update every 200ms
+    PROGRESS_UPDATE_INTERVAL = 0.2  # Redraw at most every 200ms while data flows
+    PROGRESS_IDLE_INTERVAL = 1.0  # Redraw (and check for stalls) at least this often
     STALL_TIMEOUT = 10.0  # 10 seconds of zero progress = stall
-    recent_speeds = []
+    progress_cv = state.get('progress_cv')
+    smoothed_speed = None
     previous_eta = 0
     last_bytes = 0
     last_time = time.time()
@@ -559,8 +1259,18 @@ def progress_update_thread(state: dict, stop_event: threading.Event, stall_callb
 
     while not stop_event.is_set():
         try:
-            # Wait for the update interval
-            stop_event.wait(PROGRESS_UPDATE_INTERVAL)
+            if progress_cv is not None:
+                # Sleep until the data path reports progress (or the idle interval
+                # passes), then hold off until a full update interval since the last redraw
+                with progress_cv:
+                    if not stop_event.is_set():
+                        progress_cv.wait(PROGRESS_IDLE_INTERVAL)
+                remaining = PROGRESS_UPDATE_INTERVAL - (time.time() - last_time)
+                if remaining > 0:
+                    stop_event.wait(remaining)
+            else:
+                # Wait for the update interval
+                stop_event.wait(PROGRESS_UPDATE_INTERVAL)
             if stop_event.is_set():
                 break
 
@@ -590,7 +1300,7 @@ def progress_update_thread(state: dict, stop_event: threading.Event, stall_callb
                 delta_time = current_time - last_time
 
                 # Calculate smoothed speed using delta values
-                smoothed_speed = calculate_smoothed_speed(recent_speeds, delta_bytes, delta_time)
+                smoothed_speed = calculate_smoothed_speed(smoothed_speed, delta_bytes, delta_time)
 
             speed_str = format_speed(smoothed_speed)
 
@@ -637,7 +1347,8 @@ def progress_update_thread(state: dict, stop_event: threading.Event, stall_callb
             files_metadata = state.get('files_metadata', [])
 
             if files_metadata:
-                current_file = get_current_file_info(stream_position, files_metadata)
+                current_file = get_current_file_info(stream_position, files_metadata,
+                                                     state.get('stream_offsets'))
                 if current_file:
                     # Calculate bytes transferred for current file
                     file_offset = current_file['offset']
@@ -666,6 +1377,49 @@ def progress_update_thread(state: dict, stop_event: threading.Event, stall_callb
             log_debug(f"Progress thread error: {e}")
             continue
 
+def notify_progress(state: dict):
+    """Wake the progress thread after updating the shared progress state"""
+    progress_cv = state.get('progress_cv')
+    if progress_cv is not None:
+        with progress_cv:
+            progress_cv.notify_all()
+
+# How long teardown waits for the progress thread, and how often it rechecks
+PROGRESS_STOP_TIMEOUT = 1.0
+PROGRESS_STOP_POLL = 0.05
+
+def start_progress_thread(state: dict, stop_event: threading.Event, stall_callback=None) -> concurrent.futures.Future:
+    """Run progress_update_thread() on a single-worker executor
+
+    Returns:
+        Future completing when the progress loop exits
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='progress')
+    future = executor.submit(progress_update_thread, state, stop_event, stall_callback)
+    executor.shutdown(wait=False)  # The submitted loop keeps running
+    return future
+
+def stop_progress_thread(state: dict, stop_event: threading.Event, future: concurrent.futures.Future):
+    """Stop the progress thread and wait up to PROGRESS_STOP_TIMEOUT for it
+
+    Waits in short slices so an interrupt is handled promptly instead of
+    blocking in a single long join.
+    """
+    stop_event.set()
+    notify_progress(state)
+    deadline = time.monotonic() + PROGRESS_STOP_TIMEOUT
+    while True:
+        try:
+            future.result(timeout=PROGRESS_STOP_POLL)
+            return
+        except concurrent.futures.TimeoutError:
+            if time.monotonic() >= deadline:
+                log_debug("Progress thread did not stop in time")
+                return
+        except Exception as e:
+            log_debug(f"Progress thread failed: {e}")
+            return
+
 def send_resend_request(client_socket, crypto, stream_position, retry_count=0):
     """Send RESEND request to sender when transfer stalls
 
@@ -684,45 +1438,147 @@ def send_resend_request(client_socket, crypto, stream_position, retry_count=0):
         }
 
         # Encrypt and send using existing protocol pattern
-        message_json = json.dumps(resend_message).encode()
-        nonce = secrets.token_bytes(12)
+        message_json = _json_dumps(resend_message)
+        nonce = crypto.next_nonce()
         encrypted_message = crypto.encrypt(message_json, nonce)
 
         # Send using standard 4-byte length prefix pattern
-        client_socket.sendall(len(nonce).to_bytes(4, 'big'))
-        client_socket.sendall(nonce)
-        client_socket.sendall(len(encrypted_message).to_bytes(4, 'big'))
-        client_socket.sendall(encrypted_message)
+        send_frame(client_socket, nonce, encrypted_message)
 
         log_debug(f"Receiver: Sent RESEND request for position {stream_position} (attempt {retry_count + 1})")
 
     except Exception as e:
         log_debug(f"Receiver: Failed to send RESEND request: {e}")
 
-def find_file_at_stream_position(collected_files, stream_position):
+def build_stream_offsets(files_metadata: List[Dict]) -> List[int]:
+    """Build the prefix-sum index used to map stream positions to files
+
+    Args:
+        files_metadata: Per-file metadata dicts with 'offset' and 'size'
+
+    Returns:
+        Start offset of each file followed by the total stream length
+    """
+    offsets = [file_info['offset'] for file_info in files_metadata]
+    offsets.append(files_metadata[-1]['offset'] + files_metadata[-1]['size'] if files_metadata else 0)
+    return offsets
+
+def find_file_at_stream_position(collected_files, stream_position, stream_offsets):
     """Find which file and offset corresponds to stream position
 
     Args:
-        collected_files: List of (file_path, relative_path) tuples
+        collected_files: List of (file_path, relative_path, size) tuples
         stream_position: Byte offset in the stream
+        stream_offsets: Index from build_stream_offsets() for collected_files
 
     Returns:
         Tuple of ((file_path, relative_path), offset_in_file) or (None, 0)
     """
-    current_position = 0
-    for file_path, relative_path in collected_files:
-        try:
-            file_size = file_path.stat().st_size
-            if current_position <= stream_position < current_position + file_size:
-                offset = stream_position - current_position
-                return (file_path, relative_path), offset
-            current_position += file_size
-        except Exception as e:
-            log_debug(f"Sender: Error checking file {relative_path}: {e}")
-            continue
+    # bisect_right lands on the last file starting at or before the position,
+    # which skips any empty files sharing that start offset
+    index = bisect.bisect_right(stream_offsets, stream_position) - 1
+    if 0 <= index < len(collected_files):
+        return collected_files[index], stream_position - stream_offsets[index]
     return None, 0
 
-def send_chunk_from_position(client_socket, crypto, file_path, offset, chunk_size, use_compression):
+class ResendSource:
+    """Keeps the most recently resent source file open between RESEND requests
+
+    Chunks are read into one reused buffer with positional reads instead of
+    being memory-mapped: a source file truncated mid-transfer just gives a
+    short read, where touching a mapping past its new end raises SIGBUS.
+    """
+
+    def __init__(self):
+        self._path = None
+        self._file = None
+        self._buffer = None  # Allocated on the first RESEND
+        self._view = None
+
+    def read(self, file_path, offset: int, size: int) -> memoryview:
+        """Read up to size bytes of file_path at offset, reusing the open handle for the same file
+
+        The returned view points into the shared buffer and is only valid
+        until the next read(); it is shorter than size at end of file.
+        """
+        if self._file is None or self._path != str(file_path):
+            self.close()
+            self._file = open(file_path, 'rb', buffering=0)
+            self._path = str(file_path)
+        if self._buffer is None or len(self._buffer) < size:
+            self._buffer = bytearray(size)
+            self._view = memoryview(self._buffer)
+        fd = self._file.fileno()
+        filled = 0
+        while filled < size:
+            target = self._view[filled:size]
+            if HAS_PREADV:
+                count = os.preadv(fd, [target], offset + filled)
+            else:
+                self._file.seek(offset + filled)
+                count = self._file.readinto(target)
+            if not count:
+                break  # End of file
+            filled += count
+        return self._view[:filled]
+
+    def close(self):
+        """Close the cached file handle"""
+        if self._file is not None:
+            self._file.close()
+        self._path = self._file = None
+
+class DecompressBuffer:
+    """Reusable output buffer that blosc decompresses frames straight into
+
+    Saves allocating a fresh bytes object for every decompressed frame. The
+    view returned by decompress() is only valid until the next call.
+    """
+
+    def __init__(self, size: int = CHUNK_SIZE):
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._address = ctypes.addressof(ctypes.c_char.from_buffer(self._buffer))
+
+    def decompress(self, data: bytes):
+        """Decompress a blosc frame, returning a memoryview into the buffer
+
+        Frames whose header doesn't describe a fitting blosc buffer go
+        through blosc.decompress(), which allocates or raises as usual.
+        """
+        nbytes, cbytes, _ = blosc.get_cbuffer_sizes(data)
+        if cbytes != len(data) or not 0 < nbytes <= len(self._buffer):
+            return blosc.decompress(data)
+        return self._view[:blosc.decompress_ptr(data, self._address)]
+
+def _looks_compressible(buf) -> bool:
+    """Cheaply guess whether a buffer is worth running the codec on
+
+    Samples a few windows spread across the buffer (a data frame can pack
+    several files): near-uniform byte histograms (already compressed or
+    encrypted content) or samples that barely shrink count as
+    incompressible, and the buffer is compressible if any window is.
+
+    Args:
+        buf: bytes-like chunk to inspect
+
+    Returns:
+        True if the chunk should be compressed
+    """
+    view = memoryview(buf)
+    step = max(len(view) // COMPRESS_PROBE_SAMPLES, COMPRESS_PROBE_SIZE)
+    for start in range(0, len(view), step):
+        sample = view[start:start + COMPRESS_PROBE_SIZE]
+        if len(set(sample)) > COMPRESS_PROBE_MAX_UNIQUE:
+            continue
+        probe = blosc.compress(sample, typesize=BLOSC_TYPESIZE, clevel=BLOSC_LEVEL,
+                               shuffle=BLOSC_SHUFFLE, cname=BLOSC_COMPRESSOR)
+        if len(probe) < COMPRESS_PROBE_MAX_RATIO * len(sample):
+            return True
+    return False
+
+def send_chunk_from_position(client_socket, crypto, file_path, offset, chunk_size, use_compression,
+                             source: ResendSource):
     """Send a specific chunk from file at offset
 
     Args:
@@ -732,44 +1588,49 @@ def send_chunk_from_position(client_socket, crypto, file_path, offset, chunk_siz
         offset: Byte offset to start reading from
         chunk_size: Number of bytes to read
         use_compression: Whether to compress the chunk
+        source: ResendSource holding the open file and read buffer
     """
     try:
-        with open(file_path, 'rb') as f:
-            f.seek(offset)
-            chunk = f.read(chunk_size)
-
-        if not chunk:
-            log_debug(f"Sender: No data at offset {offset} in {file_path}")
-            return
-
-        # Compress if needed
-        if use_compression:
-            chunk_to_send = blosc.compress(chunk, cname='lz4', clevel=3, shuffle=blosc.BITSHUFFLE, nthreads=4)
-        else:
-            chunk_to_send = chunk
+        # View into the reused read buffer; blosc and the AEAD both take buffers
+        chunk = source.read(file_path, offset, chunk_size)
+        try:
+            if not chunk:
+                log_debug(f"Sender: No data at offset {offset} in {file_path}")
+                return
 
-        # Encrypt and send (same pattern as normal chunk sending)
-        nonce = secrets.token_bytes(12)
-        encrypted_chunk = crypto.encrypt(chunk_to_send, nonce)
+            # Compress if needed
+            # Incompressible chunks go out as stored blosc frames (clevel=0): the
+            # header flags them as memcpy'd so the receiver's decompress is a copy
+            if use_compression:
+                level = BLOSC_LEVEL if _looks_compressible(chunk) else 0
+                chunk_to_send = blosc.compress(chunk, typesize=BLOSC_TYPESIZE, clevel=level,
+                                               shuffle=BLOSC_SHUFFLE, cname=BLOSC_COMPRESSOR)
+            else:
+                chunk_to_send = chunk
 
-        client_socket.sendall(len(nonce).to_bytes(4, 'big'))
-        client_socket.sendall(nonce)
-        client_socket.sendall(len(encrypted_chunk).to_bytes(4, 'big'))
-        client_socket.sendall(encrypted_chunk)
+            # Encrypt and send (same pattern as normal chunk sending)
+            nonce = crypto.next_nonce()
+            encrypted_chunk = crypto.encrypt(chunk_to_send, nonce)
+            send_frame(client_socket, nonce, encrypted_chunk)
 
-        log_debug(f"Sender: Resent {len(chunk)} bytes from offset {offset}")
+            log_debug(f"Sender: Resent {len(chunk)} bytes from offset {offset}")
+        finally:
+            chunk.release()
 
     except Exception as e:
         log_debug(f"Sender: Error resending chunk: {e}")
 
-def handle_resend_request(client_socket, crypto, collected_files, use_compression):
+def handle_resend_request(client_socket, crypto, collected_files, stream_offsets, use_compression,
+                          source: ResendSource):
     """Handle RESEND request from receiver during active transfer
 
     Args:
         client_socket: Socket connection
         crypto: SecureCrypto instance
-        collected_files: List of (file_path, relative_path) tuples
+        collected_files: List of (file_path, relative_path, size) tuples
+        stream_offsets: Index from build_stream_offsets() for collected_files
         use_compression: Whether compression is enabled
+        source: ResendSource reused across this transfer's RESEND requests
 
     Returns:
         True if RESEND was handled, False if no RESEND or error
@@ -780,15 +1641,15 @@ def handle_resend_request(client_socket, crypto, collected_files, use_compressio
         if not nonce_len_bytes or len(nonce_len_bytes) < 4:
             return False
 
-        nonce_len = int.from_bytes(nonce_len_bytes, 'big')
+        nonce_len = _U32.unpack(nonce_len_bytes)[0]
         nonce = recv_all(client_socket, nonce_len)
         msg_len_bytes = recv_all(client_socket, 4)
-        msg_len = int.from_bytes(msg_len_bytes, 'big')
+        msg_len = _U32.unpack(msg_len_bytes)[0]
         encrypted_msg = recv_all(client_socket, msg_len)
 
         # Decrypt and parse
         decrypted = crypto.decrypt(encrypted_msg, nonce)
-        resend_req = json.loads(decrypted.decode())
+        resend_req = _json_loads(decrypted)
 
         if resend_req.get('type') != 'resend_request':
             log_debug(f"Sender: Received unexpected message type: {resend_req.get('type')}")
@@ -798,7 +1659,7 @@ def handle_resend_request(client_socket, crypto, collected_files, use_compressio
         retry_count = resend_req.get('retry_count', 0)
 
         # Find which file corresponds to stream position
-        target_file, file_offset = find_file_at_stream_position(collected_files, stream_position)
+        target_file, file_offset = find_file_at_stream_position(collected_files, stream_position, stream_offsets)
 
         if not target_file:
             log_debug(f"Sender: RESEND request for invalid position {stream_position}")
@@ -807,10 +1668,9 @@ def handle_resend_request(client_socket, crypto, collected_files, use_compressio
         log_debug(f"Sender: RESEND request for position {stream_position} "
                    f"(file: {target_file[1]}, offset: {file_offset}, attempt: {retry_count + 1})")
 
-        # Send a chunk from the requested position (1MB)
-        resend_chunk_size = 1024 * 1024  # 1MB
+        # Send one data frame's worth from the requested position
         send_chunk_from_position(client_socket, crypto, target_file[0],
-                                file_offset, resend_chunk_size, use_compression)
+                                file_offset, CHUNK_SIZE, use_compression, source)
 
         return True
 
@@ -841,12 +1701,27 @@ def format_size(size: int) -> str:
     else:
         return f"{size / (1024 * 1024 * 1024):.1f} GB"
 
-def get_current_file_info(stream_position: int, files_metadata: List[Dict]) -> Optional[Dict]:
-    """Get information about the file currently being processed at stream position"""
-    for file_info in files_metadata:
-        file_start = file_info['offset']
-        file_end = file_info['offset'] + file_info['size']
-        if file_start <= stream_position < file_end:
+def get_current_file_info(stream_position: int, files_metadata: List[Dict],
+                          stream_offsets: Optional[List[int]] = None) -> Optional[Dict]:
+    """Get information about the file currently being processed at stream position
+
+    Args:
+        stream_position: Byte offset in the stream
+        files_metadata: Per-file metadata dicts in stream order
+        stream_offsets: Index from build_stream_offsets() for files_metadata;
+            pass it on hot paths so each lookup is a single bisect
+
+    Returns:
+        Metadata dict of the file covering the position, or None
+    """
+    if stream_offsets is None:
+        stream_offsets = build_stream_offsets(files_metadata)
+    # bisect_right lands on the last file starting at or before the position,
+    # which skips any empty files sharing that start offset
+    index = bisect.bisect_right(stream_offsets, stream_position) - 1
+    if 0 <= index < len(files_metadata):
+        file_info = files_metadata[index]
+        if stream_position < file_info['offset'] + file_info['size']:
             return file_info
     return None
 
@@ -854,41 +1729,69 @@ def print_transfer_progress(filename: str, file_size: int, progress_percent: flo
                            speed_str: str, eta_str: str, is_first_update: bool,
                            action: str = "Transferring", warning_msg: str = "",
                            current_file_bytes: int = 0):
-    """Print three-line progress display with file info, progress, and warnings"""
+    """Print three-line progress display with file info, progress, and warnings
+
+    The whole frame is encoded once and written straight to stdout's file
+    descriptor, so each redraw is normally a single write() syscall.
+    """
     current_str = format_size(current_file_bytes)
     total_str = format_size(file_size)
 
-    if not is_first_update:
-        # Move cursor up 2 lines to overwrite all three lines
-        safe_print("\033[2A\r", end='')
-
-    # Line 1: Current filename being processed (clear line and print)
-    safe_print(f"\r{action}: {filename} ({current_str}/{total_str})\033[K")
+    # Move cursor up 2 lines to overwrite all three lines, then: current file,
+    # overall progress/speed/ETA, and the warning line (cleared when empty, no newline)
+    frame = (("" if is_first_update else "\033[2A") +
+             f"\r{action}: {filename} ({current_str}/{total_str})\033[K\n"
+             f"\rProgress: {progress_percent:.1f}% | Speed: {speed_str} | ETA: {eta_str}\033[K\n"
+             f"\r{warning_msg}\033[K")
 
-    # Line 2: Overall progress, speed, and ETA (clear line and print)
-    safe_print(f"\rProgress: {progress_percent:.1f}% | Speed: {speed_str} | ETA: {eta_str}\033[K")
-
-    # Line 3: Warning messages (clear line and print, no newline at end)
-    if warning_msg:
-        safe_print(f"\r{warning_msg}\033[K", end='', flush=True)
-    else:
-        safe_print(f"\r\033[K", end='', flush=True)  # Clear warning line
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, OSError):
+        # No real descriptor behind stdout (e.g. redirected to a StringIO)
+        safe_print(frame, end='', flush=True)
+        return
+
+    data = memoryview(frame.encode(sys.stdout.encoding or 'utf-8', 'replace'))
+    written = 0
+    try:
+        sys.stdout.flush()  # Keep ordering with anything pending in the text layer
+        # os.write() reports exactly what went out, so a failure part-way
+        # through leaves a known remainder instead of a reprinted frame
+        while written < len(data):
+            written += os.write(fd, data[written:])
+    except (BrokenPipeError, IOError, OSError):
+        # stdout is broken: send only what it didn't take to stderr
+        try:
+            sys.stderr.buffer.write(data[written:])
+            sys.stderr.flush()
+        except (AttributeError, ValueError, OSError):
+            pass  # Both stdout and stderr broken
 
 class TailscaleDetector:
     """Tailscale network detection and peer validation"""
     
     _peer_cache = {}
-    _cache_timeout = 30  # seconds
+    _cache_timeout = 120  # seconds
     _last_cache_update = 0
+    # First two columns (IP, hostname) of each `tailscale status` line
+    _PEER_RE = re.compile(rb'^[ \t]*([^\s#]\S*)[ \t]+(\S+)', re.M)
+    # This machine's own Tailscale IP rarely changes; cache it to skip the subprocess
+    _self_ip_cache = None
+    _self_ip_time = 0
+    _self_ip_timeout = 300  # seconds
     
     @classmethod
     def get_tailscale_ip(cls) -> Optional[str]:
         """Get the Tailscale IP address for this machine"""
+        if cls._self_ip_cache is not None and time.time() - cls._self_ip_time < cls._self_ip_timeout:
+            return cls._self_ip_cache
         try:
             result = subprocess.run(['tailscale', 'ip', '--4'], 
                                   capture_output=True, text=True, timeout=10)
             if result.returncode == 0:
-                return result.stdout.strip()
+                cls._self_ip_cache = result.stdout.strip()
+                cls._self_ip_time = time.time()
+                return cls._self_ip_cache
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         return None
@@ -924,23 +1827,20 @@ class TailscaleDetector:
         if current_time - cls._last_cache_update >= cls._cache_timeout:
             cls._update_peer_cache()
         
-        return cls._peer_cache.get(ip, (False, None))
+        # Negative-cache misses so repeated lookups of an unknown IP stay O(1)
+        return cls._peer_cache.setdefault(ip, (False, None))
     
     @classmethod
     def _update_peer_cache(cls):
         """Update the peer cache"""
         try:
             result = subprocess.run(['tailscale', 'status'], 
-                                  capture_output=True, text=True, timeout=10)
+                                  capture_output=True, timeout=10)
             if result.returncode == 0:
-                cls._peer_cache.clear()
-                for line in result.stdout.split('\n'):
-                    if line.strip() and not line.startswith('#'):
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            ip = parts[0]
-                            name = parts[1] if len(parts) > 1 else "unknown"
-                            cls._peer_cache[ip] = (True, name)
+                cls._peer_cache = {
+                    match.group(1).decode(): (True, match.group(2).decode(errors='replace'))
+                    for match in cls._PEER_RE.finditer(result.stdout)
+                }
                 cls._last_cache_update = time.time()
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
@@ -976,74 +1876,94 @@ class SecureTokenGenerator:
         "legend", "myth", "tale", "saga", "epic", "chronicle", "story", "fable",
         "magic", "spell", "charm", "enchantment", "sorcery", "wizardry", "alchemy", "potion"
     ]
+    # Deduplicated, interned view of WORDS (the literal list repeats a few entries)
+    _WORDS = tuple(sys.intern(word) for word in dict.fromkeys(WORDS))
+    _WORD_COUNT = len(_WORDS)
+    # Largest multiple of the word count below 2**32; draws at or above it are
+    # rejected so "value % count" stays uniform
+    _DRAW_LIMIT = (1 << 32) // _WORD_COUNT * _WORD_COUNT
     
     @classmethod
     def generate_token(cls) -> str:
         """Generate a secure two-word token"""
-        # Use cryptographically secure random selection
-        word1 = secrets.choice(cls.WORDS)
-        word2 = secrets.choice(cls.WORDS)
-        return f"{word1}-{word2}"
+        # One os.urandom() read covers both words (rejection is ~1-in-10^7 rare)
+        while True:
+            draw = os.urandom(8)
+            first = int.from_bytes(draw[:4], 'little')
+            second = int.from_bytes(draw[4:], 'little')
+            if first < cls._DRAW_LIMIT and second < cls._DRAW_LIMIT:
+                return f"{cls._WORDS[first % cls._WORD_COUNT]}-{cls._WORDS[second % cls._WORD_COUNT]}"
 
 class FileWriter:
     """Manages incremental file writing with hash tracking for resume capability"""
+
+    FLUSH_INTERVAL = 10 * 1024 * 1024  # Update the lock file every 10MB
     
     def __init__(self, filename: str, size: int, offset: int, lock_manager: 'TransferLockManager' = None, overwrite_mode: bool = False, output_dir: str = '.'):
         self.filename = filename
         self.size = size
         self.offset = offset
+        self.file_end = offset + size  # Stream position just past this file's data
         self.written = 0
-        self.hasher = hashlib.sha256()
+        self.hasher = new_sha256()
         self.output_dir = Path(output_dir)
         self.part_file = self.output_dir / f"{filename}.part"
         self.is_complete = False
         self.lock_manager = lock_manager
         self.needs_rehash = False
+        self.completed_earlier = False  # Finished by a previous session; nothing streamed into hasher
+        self.final_path = None  # Where complete_file() put the data
         self.overwrite_mode = overwrite_mode
+        self._fh = None  # Persistent unbuffered handle on part_file, opened on first write
+        self._lock_entry = lock_manager.get_file_entry(filename) if lock_manager else None
+        # Byte count at which write_chunk next reports to the lock manager
+        self._next_lock_update = self.FLUSH_INTERVAL
+        self._writeback_offset = 0  # Bytes already handed to start_writeback()
         
     def open_for_writing(self, resume_bytes: int = 0):
-        """Prepare file for writing, optionally resuming from specific byte offset"""
-        # Create parent directories
-        self.part_file.parent.mkdir(parents=True, exist_ok=True)
-        
+        """Prepare file for writing, optionally resuming from specific byte offset
+
+        Parent directories are created up front by LazyFileWriterDict.
+        """
         if resume_bytes > 0 and self.part_file.exists():
             # Resume from specific byte offset based on lock file
             actual_size = self.part_file.stat().st_size
             if actual_size == resume_bytes and resume_bytes < self.size:
                 self.written = resume_bytes
                 self.needs_rehash = True  # Need to rehash existing data
+                self._next_lock_update = resume_bytes + self.FLUSH_INTERVAL
+                self._writeback_offset = resume_bytes
                 if self.lock_manager:
                     self.lock_manager.update_file_status(self.filename, "in_progress", self.written)
             else:
                 # Size mismatch, start fresh
                 self.written = 0
-                self.hasher = hashlib.sha256()
+                self.hasher = new_sha256()
                 if self.lock_manager:
                     self.lock_manager.update_file_status(self.filename, "pending", 0)
         elif resume_bytes >= self.size:
             # File already complete according to lock
             self.is_complete = True
+            self.completed_earlier = True
+            recorded_path = self._lock_entry.get("final_path") if self._lock_entry else None
+            self.final_path = self.output_dir / (recorded_path or self.filename)
             if self.lock_manager:
                 self.lock_manager.update_file_status(self.filename, "completed", self.size)
             return
         else:
             # Start fresh
             self.written = 0
-            self.hasher = hashlib.sha256()
+            self.hasher = new_sha256()
             if self.lock_manager:
                 self.lock_manager.update_file_status(self.filename, "pending", 0)
     
     def _ensure_resume_hash(self):
         """Verify existing data by rehashing if needed (only done once)"""
         if self.needs_rehash:
-            self.hasher = hashlib.sha256()
+            self.hasher = new_sha256()
             try:
-                with open(self.part_file, 'rb') as f:
-                    while True:
-                        chunk = f.read(64 * 1024)
-                        if not chunk:
-                            break
-                        self.hasher.update(chunk)
+                with open(self.part_file, 'rb', buffering=0) as f:
+                    self.hasher = hash_open_file(f)
                 
                 # Update lock file with partial hash
                 if self.lock_manager:
@@ -1053,11 +1973,31 @@ class FileWriter:
             except OSError:
                 # If we can't read the file, start fresh
                 self.written = 0
-                self.hasher = hashlib.sha256()
+                self.hasher = new_sha256()
                 if self.lock_manager:
                     self.lock_manager.update_file_status(self.filename, "pending", 0)
             
             self.needs_rehash = False
+
+    def _open_handle(self):
+        """Open part_file once, positioned at the current write offset
+
+        Unbuffered: chunks arrive as whole frame segments, so a userspace
+        buffer would only add a copy and periodic flushes.
+        """
+        self._fh = open(self.part_file, 'r+b' if self.written > 0 else 'wb', buffering=0)
+        if self.written > 0:
+            self._fh.seek(self.written)
+        advise_sequential(self._fh)  # Strictly sequential, append-only writes
+        preallocate(self._fh, self.written, self.size - self.written)
+
+    def _close_handle(self):
+        """Close the persistent handle if open"""
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
     
     def write_chunk(self, data: bytes) -> int:
         """Write data chunk and update hash. Returns bytes written."""
@@ -1069,23 +2009,30 @@ class FileWriter:
             
         bytes_to_write = min(len(data), self.size - self.written)
         if bytes_to_write > 0:
-            chunk_to_write = data[:bytes_to_write]
+            # Zero-copy slice; file write and hasher both take the buffer directly
+            chunk_to_write = memoryview(data)[:bytes_to_write]
 
-            # Open file, write data, and immediately close
+            # Keep one handle open across chunks instead of an open()/close() per write
             try:
-                with open(self.part_file, 'ab' if self.written > 0 else 'wb') as f:
-                    f.write(chunk_to_write)
-                    # Flush every 10MB or when file is complete (reduces I/O blocking by ~10x)
-                    if self.written % (10 * 1024 * 1024) < len(chunk_to_write) or self.written + bytes_to_write >= self.size:
-                        f.flush()
-
+                if self._fh is None:
+                    self._open_handle()
+                # Raw writes may be short; loop until the whole slice is in the kernel
+                remaining = chunk_to_write
+                while remaining:
+                    remaining = remaining[self._fh.write(remaining):]
                 self.hasher.update(chunk_to_write)
                 self.written += bytes_to_write
 
-                # Update lock file every 10MB or when complete (reduces lock file I/O)
-                if self.lock_manager:
-                    if self.written % (10 * 1024 * 1024) < len(chunk_to_write) or self.written >= self.size:
-                        self.lock_manager.update_file_status(self.filename, "in_progress", self.written)
+                # Start writeback every 10MB so finished files are mostly clean,
+                # and so droppable, when complete_file() advises their pages away
+                if self.written - self._writeback_offset >= self.FLUSH_INTERVAL:
+                    start_writeback(self._fh, self._writeback_offset, self.written - self._writeback_offset)
+                    self._writeback_offset = self.written
+
+                # Update lock file every 10MB (complete_file() records completion)
+                if self.written >= self._next_lock_update and self._lock_entry is not None:
+                    self.lock_manager.update_bytes_fast(self.filename, self._lock_entry, self.written)
+                    self._next_lock_update = self.written + self.FLUSH_INTERVAL
 
                 # Check if file is complete
                 if self.written >= self.size:
@@ -1098,50 +2045,79 @@ class FileWriter:
                 
         return bytes_to_write
     
+    def _move_to_free_name(self, final_path: Path) -> Path:
+        """Move the part file to final_path, or name_1.ext, name_2.ext... if taken
+
+        Args:
+            final_path: Preferred destination path
+
+        Returns:
+            Path the part file ended up at
+        """
+        # Hard-link to each candidate and let the kernel report collisions,
+        # rather than stat()-ing every candidate and racing on the rename
+        candidate = final_path
+        counter = 1
+        while True:
+            try:
+                os.link(self.part_file, candidate)
+                os.unlink(self.part_file)
+                return candidate
+            except FileExistsError:
+                candidate = final_path.with_name(f"{final_path.stem}_{counter}{final_path.suffix}")
+                counter += 1
+            except OSError:
+                break  # Filesystem without hard links (FAT, some network mounts)
+
+        while candidate.exists():
+            candidate = final_path.with_name(f"{final_path.stem}_{counter}{final_path.suffix}")
+            counter += 1
+        os.replace(self.part_file, candidate)
+        return candidate
+
     def complete_file(self):
         """Mark file as complete and move from .part to final name"""
         if self.written == self.size and not self.is_complete:
             try:
                 # Move .part file to final location
                 final_path = self.output_dir / self.filename
-                
+                if HAS_FADVISE and _sync_file_range is not None and self._fh is not None:
+                    # Finished files aren't re-read here; let the kernel drop their
+                    # pages instead of evicting other processes' cache. Only pages
+                    # already written back (all but roughly the last 10MB, see
+                    # write_chunk) are clean enough to drop; the tail stays cached
+                    try:
+                        os.posix_fadvise(self._fh.fileno(), 0, self.size, os.POSIX_FADV_DONTNEED)
+                    except OSError:
+                        pass
+                self._close_handle()
+
                 # Handle filename conflicts based on overwrite mode
-                if self.overwrite_mode and final_path.exists():
-                    # Overwrite mode: remove existing file/directory
+                if self.overwrite_mode:
+                    # Overwrite mode: os.replace() swaps out an existing file
+                    # atomically; only a directory has to be removed first
                     try:
                         if final_path.is_dir():
                             shutil.rmtree(final_path)
-                        else:
-                            final_path.unlink()
+                        os.replace(self.part_file, final_path)
                     except OSError as e:
-                        log_debug(f"Failed to remove existing file {final_path}: {e}")
+                        log_debug(f"Failed to replace existing file {final_path}: {e}")
                         # Fall back to renaming if overwrite fails
-                        counter = 1
-                        original_path = final_path
-                        while final_path.exists():
-                            parent_dir = original_path.parent
-                            name_parts = original_path.stem, counter, original_path.suffix
-                            final_path = parent_dir / f"{name_parts[0]}_{name_parts[1]}{name_parts[2]}"
-                            counter += 1
-                elif not self.overwrite_mode:
+                        final_path = self._move_to_free_name(final_path)
+                else:
                     # Non-overwrite mode: rename if conflict exists (preserve current behavior)
-                    counter = 1
-                    original_path = final_path
-                    while final_path.exists():
-                        parent_dir = original_path.parent
-                        name_parts = original_path.stem, counter, original_path.suffix
-                        final_path = parent_dir / f"{name_parts[0]}_{name_parts[1]}{name_parts[2]}"
-                        counter += 1
-
-                # Ensure parent directories exist for final destination
-                final_path.parent.mkdir(parents=True, exist_ok=True)
-
-                self.part_file.rename(final_path)
+                    final_path = self._move_to_free_name(final_path)
+
                 self.is_complete = True
+                self.final_path = final_path
                 
                 # Update lock file with completion
                 if self.lock_manager:
                     final_hash = self.hasher.hexdigest()
+                    if self._lock_entry is not None:
+                        # Lets a resumed session reuse final_hash instead of rehashing
+                        self._lock_entry["final_path"] = str(final_path.relative_to(self.output_dir))
+                        self._lock_entry["final_stat"] = self._stat_signature(final_path)
                     self.lock_manager.update_file_status(self.filename, "completed", self.size, final_hash)
                 
                 # print(f"Completed: {final_path}")  # Removed to keep clean progress display
@@ -1152,34 +2128,72 @@ class FileWriter:
     def get_hash(self) -> str:
         """Get current hash of written data"""
         return self.hasher.hexdigest()
+
+    @staticmethod
+    def _stat_signature(path) -> Optional[List[int]]:
+        """Size and mtime of path, used to tell whether a finished file was touched"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def recorded_hash(self) -> Optional[str]:
+        """Hash a previous session recorded on completing this file
+
+        Only returned while the final file still has the size and mtime seen
+        at completion; otherwise None, and the caller rehashes it from disk.
+        """
+        entry = self._lock_entry
+        if not (self.completed_earlier and entry and entry.get("partial_hash")
+                and entry.get("final_stat")):
+            return None
+        if self._stat_signature(self.final_path) != entry["final_stat"]:
+            return None
+        return entry["partial_hash"]
     
     def reset_for_retry(self):
         """Reset file writer for retry attempt"""
-        self.hasher = hashlib.sha256()
+        self.hasher = new_sha256()
         self.written = 0
         self.is_complete = False
         self.needs_rehash = False
+        self.completed_earlier = False
+        self._next_lock_update = self.FLUSH_INTERVAL
+        self._writeback_offset = 0
         
         # Update lock file to pending status
         if self.lock_manager:
             self.lock_manager.update_file_status(self.filename, "pending", 0)
         
-        # Remove the corrupted part file
+        # Remove the corrupted part file, and the final file if it was already
+        # moved into place, so the retry lands under the intended name
+        try:
+            self._close_handle()
+        except OSError:
+            pass
         if self.part_file.exists():
             try:
                 self.part_file.unlink()
             except:
                 pass  # Ignore errors during cleanup
+        if self.final_path is not None:
+            try:
+                self.final_path.unlink()
+            except OSError:
+                pass
+            self.final_path = None
     
     def needs_data(self, stream_position: int) -> bool:
         """Check if this file needs data at the given stream position"""
-        file_start = self.offset
-        file_end = self.offset + self.size
-        return file_start <= stream_position < file_end and not self.is_complete
+        return self.offset <= stream_position < self.file_end and not self.is_complete
     
     def close(self):
-        """Close file handle - no-op since we don't keep handles open"""
-        pass  # Files are opened and closed immediately in write_chunk
+        """Close the part file handle, if one is open"""
+        try:
+            self._close_handle()
+        except OSError as e:
+            log_debug(f"Failed to close {self.part_file}: {e}")
 
 
 class LazyFileWriterDict:
@@ -1210,13 +2224,24 @@ class LazyFileWriterDict:
         self._overwrite_mode = overwrite_mode
         self._writers = {}  # Created on-demand
 
-        # OPTIMIZATION: Build offset index for O(1) lookups (sorted by start offset)
-        self._offset_index = []
-        for file_info in files_info:
-            start = file_info['offset']
-            end = start + file_info['size']
-            self._offset_index.append((start, end, file_info['filename']))
-        self._offset_index.sort(key=lambda x: x[0])  # Sort by start offset
+        # OPTIMIZATION: Parallel lists sorted by start offset, so lookups bisect
+        # a plain int list instead of comparing (start, end, filename) tuples
+        offset_index = sorted(
+            (f['offset'], f['offset'] + f['size'], f['filename']) for f in files_info
+        )
+        self._starts = [start for start, _, _ in offset_index]
+        self._ends = [end for _, end, _ in offset_index]
+        self._names = [name for _, _, name in offset_index]
+        self._last_index = 0  # File the previous lookup ended in (checked before bisecting)
+
+        # OPTIMIZATION: Create each destination directory once here rather than
+        # a mkdir() per FileWriter (many files usually share a directory)
+        output_path = Path(output_dir)
+        for parent_dir in {(output_path / name).parent for name in self._names}:
+            try:
+                parent_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                log_debug(f"Failed to create directory {parent_dir}: {e}")
 
     def __getitem__(self, filename: str) -> FileWriter:
         """Get existing writer or create new one on first access"""
@@ -1272,6 +2297,56 @@ class LazyFileWriterDict:
         """Return total number of files in transfer (not just created writers)"""
         return len(self._files_info)
 
+    def get_writers_for_range(self, stream_position: int, length: int) -> List[Tuple['FileWriter', int, int]]:
+        """Map a run of stream bytes onto the files it covers
+
+        Runs usually continue inside the file the previous run ended in, so
+        that file is checked first; only a miss costs a bisect.
+
+        Args:
+            stream_position: Stream position of the first byte in the run
+            length: Number of bytes in the run
+
+        Returns:
+            List of (writer, begin, end) tuples; begin/end are offsets into the run
+        """
+        spans = []
+        run_end = stream_position + length
+        starts, ends, names = self._starts, self._ends, self._names
+        idx = self._last_index
+        if not (idx < len(starts) and starts[idx] <= stream_position < ends[idx]):
+            idx = max(bisect.bisect_right(starts, stream_position) - 1, 0)
+        while idx < len(starts) and starts[idx] < run_end:
+            begin = max(starts[idx], stream_position)
+            end = min(ends[idx], run_end)
+            if begin < end:
+                spans.append((self[names[idx]], begin - stream_position, end - stream_position))
+                self._last_index = idx
+            idx += 1
+        return spans
+
+    def write_range(self, stream_position: int, chunk: bytes):
+        """Write a run of stream bytes into the files it covers
+
+        Bytes a resumed writer already has on disk are skipped, so data lands
+        at its own in-file offset instead of being appended after the resume point.
+
+        Args:
+            stream_position: Stream position of chunk's first byte
+            chunk: The bytes
+        """
+        chunk_view = memoryview(chunk)  # Hand out zero-copy slices
+        for writer, begin, end in self.get_writers_for_range(stream_position, len(chunk)):
+            if writer.is_complete:
+                continue
+            file_position = stream_position + begin - writer.offset
+            if file_position < writer.written:
+                begin += writer.written - file_position
+            elif file_position > writer.written:
+                continue  # Gap before this run; the writer can't accept it
+            if begin < end:
+                writer.write_chunk(chunk_view[begin:end])
+
     def get_writer_at_offset(self, stream_position: int):
         """Get the writer for the file at the given stream position (O(log N) lookup)
 
@@ -1281,26 +2356,44 @@ class LazyFileWriterDict:
         Returns:
             FileWriter for the file at this position, or None if position is beyond all files
         """
-        # OPTIMIZATION: Use binary search on sorted offset index for O(log N) lookup
-        # Since files are transferred sequentially, we could also optimize for sequential access
-        # but binary search is fast enough and handles any access pattern
-        import bisect
+        spans = self.get_writers_for_range(stream_position, 1)
+        return spans[0][0] if spans else None
 
-        # Binary search to find the file containing this position
-        # We search for the rightmost file start <= stream_position
-        idx = bisect.bisect_right(self._offset_index, (stream_position, float('inf'), ''))
 
-        if idx > 0:
-            start, end, filename = self._offset_index[idx - 1]
-            if start <= stream_position < end:
-                return self[filename]  # Creates writer on-demand via __getitem__
+class SecureCrypto:
+    """Cryptographic operations for secure file transfer"""
 
-        # Position is beyond all files
-        return None
+    # 1-byte cipher preference each peer sends right after its public key
+    CIPHER_CHACHA20 = b'\x00'
+    CIPHER_AESGCM = b'\x01'
 
+    _aes_acceleration = None  # Cached result of has_aes_acceleration()
 
-class SecureCrypto:
-    """Cryptographic operations for secure file transfer"""
+    # Counter nonce layout: 4-byte direction prefix + 8-byte big-endian counter
+    _NONCE = struct.Struct('>4sQ')
+
+    @classmethod
+    def has_aes_acceleration(cls) -> bool:
+        """Check whether this CPU has AES instructions (AES-NI / ARMv8 crypto)
+
+        Without them AES-GCM falls back to slow, table-based software and
+        ChaCha20-Poly1305 is the faster choice.
+        """
+        if cls._aes_acceleration is None:
+            accelerated = False
+            try:
+                # 'flags' on x86, 'Features' on ARM
+                with open('/proc/cpuinfo', 'r') as f:
+                    for line in f:
+                        if line.startswith(('flags', 'Features')) and 'aes' in line.split(':', 1)[-1].split():
+                            accelerated = True
+                            break
+            except OSError:
+                # No /proc (macOS): Apple Silicon and every Intel Mac have AES instructions
+                accelerated = sys.platform == 'darwin' and platform.machine() in ('arm64', 'x86_64')
+            cls._aes_acceleration = accelerated
+            log_debug(f"AES hardware acceleration: {accelerated}")
+        return cls._aes_acceleration
     
     def __init__(self):
         """Initialize with fresh X25519 key pair"""
@@ -1308,6 +2401,12 @@ class SecureCrypto:
         self.public_key = self.private_key.public_key()
         self.session_key = None
         self.cipher = None
+        self.cipher_name = None
+        # Counter nonces: 4-byte direction prefix + 8-byte big-endian counter
+        self._send_prefix = None
+        self._recv_prefix = None
+        self._send_counter = 0
+        self._recv_counter = 0
     
     def get_public_key_bytes(self) -> bytes:
         """Get public key as bytes for transmission"""
@@ -1316,25 +2415,65 @@ class SecureCrypto:
             format=serialization.PublicFormat.Raw
         )
     
-    def derive_session_key(self, peer_public_key_bytes: bytes, shared_token: str):
-        """Derive session key from ECDH + shared token"""
-        # Reconstruct peer's public key
+    def get_cipher_preference(self) -> bytes:
+        """Get the 1-byte cipher preference sent alongside our public key"""
+        return self.CIPHER_AESGCM if self.has_aes_acceleration() else self.CIPHER_CHACHA20
+
+    def derive_session_key(self, peer_public_key_bytes: bytes, shared_token: str,
+                           peer_cipher_preference: bytes = CIPHER_CHACHA20):
+        """Derive session key from ECDH + shared token
+
+        AES-256-GCM is used only when both peers prefer it; otherwise
+        ChaCha20Poly1305. The choice is bound into the HKDF info, so peers
+        that disagree (or a tampered preference byte) derive different keys
+        and fail the challenge.
+        """
+        # Reconstruct peer's public key (from_public_bytes requires bytes, not a bytearray)
+        peer_public_key_bytes = bytes(peer_public_key_bytes)
         peer_public_key = x25519.X25519PublicKey.from_public_bytes(peer_public_key_bytes)
         
         # Perform ECDH
         shared_key = self.private_key.exchange(peer_public_key)
         
         # Derive session key using HKDF with token as salt
+        use_aes_gcm = (self.get_cipher_preference() == self.CIPHER_AESGCM and
+                       peer_cipher_preference == self.CIPHER_AESGCM)
         hkdf = HKDF(
             algorithm=hashes.SHA256(),
-            length=32,  # ChaCha20 key size
+            length=32,  # ChaCha20 and AES-256 key size
             salt=shared_token.encode(),
-            info=b'file-transfer-session'
+            info=b'file-transfer-session-aes256gcm' if use_aes_gcm else b'file-transfer-session'
         )
         self.session_key = hkdf.derive(shared_key)
         
-        # Initialize cipher
-        self.cipher = ChaCha20Poly1305(self.session_key)
+        # Initialize cipher (both take a 96-bit nonce, so the counter scheme is shared)
+        if use_aes_gcm:
+            self.cipher = AESGCM(self.session_key)
+            self.cipher_name = 'aes-256-gcm'
+        else:
+            self.cipher = ChaCha20Poly1305(self.session_key)
+            self.cipher_name = 'chacha20-poly1305'
+        log_debug(f"Session cipher: {self.cipher_name}")
+
+        # Both directions share the session key, so each side gets its own nonce
+        # prefix (ordered by public key) and counters can start at zero safely
+        own_public_key_bytes = self.get_public_key_bytes()
+        if own_public_key_bytes == peer_public_key_bytes:
+            raise ValueError("Peer public key matches our own")
+        if own_public_key_bytes < peer_public_key_bytes:
+            self._send_prefix, self._recv_prefix = b'\x00\x00\x00\x01', b'\x00\x00\x00\x02'
+        else:
+            self._send_prefix, self._recv_prefix = b'\x00\x00\x00\x02', b'\x00\x00\x00\x01'
+        self._send_counter = 0
+        self._recv_counter = 0
+
+    def next_nonce(self) -> bytes:
+        """Return the next 96-bit counter nonce for an outgoing message (RFC 7539)"""
+        if not self._send_prefix:
+            raise RuntimeError("Session key not established")
+        nonce = self._NONCE.pack(self._send_prefix, self._send_counter)
+        self._send_counter += 1
+        return nonce
     
     def encrypt(self, data: bytes, nonce: bytes) -> bytes:
         """Encrypt data with session key"""
@@ -1343,10 +2482,20 @@ class SecureCrypto:
         return self.cipher.encrypt(nonce, data, None)
     
     def decrypt(self, ciphertext: bytes, nonce: bytes) -> bytes:
-        """Decrypt data with session key"""
+        """Decrypt data with session key, rejecting replayed or out-of-order nonces"""
         if not self.cipher:
             raise RuntimeError("Session key not established")
-        return self.cipher.decrypt(nonce, ciphertext, None)
+        if len(nonce) != 12:
+            raise ValueError("Unexpected nonce prefix")
+        prefix, counter = self._NONCE.unpack(nonce)
+        if prefix != self._recv_prefix:
+            raise ValueError("Unexpected nonce prefix")
+        if counter < self._recv_counter:
+            raise ValueError(f"Replayed nonce (counter {counter} < {self._recv_counter})")
+        plaintext = self.cipher.decrypt(nonce, ciphertext, None)
+        # Only advance after the tag verified, so forged frames can't desync us
+        self._recv_counter = counter + 1
+        return plaintext
 
 
 class TransferLockManager:
@@ -1358,11 +2507,23 @@ class TransferLockManager:
     def __init__(self, working_dir: str = "."):
         self.working_dir = Path(working_dir)
         self.lock_file_path = self.working_dir / self.LOCK_FILE_NAME
+        # Append-only JSONL journal of per-file status deltas on top of the snapshot
+        self._journal_path = self.lock_file_path.with_suffix('.jsonl')
+        self._journal = None
         self.lock_data = None
-        self._pending_updates = {}  # Buffer for batched updates
+        self._dirty_files = set()  # Files whose lock_data entry changed since the last flush
         self._last_save_time = 0
         self._save_interval = 2.0  # Save every 2 seconds max
         self._max_pending = 150   # Max pending updates before forced save
+        # Guards swapping _dirty_files out against concurrent adds, and keeps
+        # journal appends from interleaving
+        self._dirty_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        # Background flusher (start_background_flush): the writing thread only
+        # marks entries dirty and wakes it, never waiting on the journal fsync
+        self._flusher = None
+        self._flush_wakeup = threading.Event()
+        self._flusher_stop = False
         # OPTIMIZATION: Defer mode for bulk FileWriter creation
         self._defer_mode = False
         self._deferred_updates = []
@@ -1379,20 +2540,19 @@ class TransferLockManager:
             "sender_ip": sender_ip,
             "total_files": len(file_list),
             "total_size": total_size,
-            "files": {}
-        }
-        
-        # Add each file to the lock
-        for file_info in file_list:
-            filename = file_info.get('path') or file_info.get('filename')
-            lock_data["files"][filename] = {
-                "status": "pending",
-                "size": file_info["size"],
-                "original_hash": None,  # Will be set by sender
-                "transferred_bytes": 0,
-                "partial_hash": None,
-                "last_modified": None
+            # Build every file entry in one comprehension
+            "files": {
+                (file_info.get('path') or file_info.get('filename')): {
+                    "status": "pending",
+                    "size": file_info["size"],
+                    "original_hash": None,  # Will be set by sender
+                    "transferred_bytes": 0,
+                    "partial_hash": None,
+                    "last_modified": None
+                }
+                for file_info in file_list
             }
+        }
         
         self.lock_data = lock_data
         self._save_lock_file()
@@ -1404,13 +2564,16 @@ class TransferLockManager:
             return False
         
         try:
-            with open(self.lock_file_path, 'r', encoding='utf-8') as f:
-                self.lock_data = json.load(f)
+            self.lock_data = _json_loads(self.lock_file_path.read_bytes())
             
             # Validate lock file structure
             if not self._validate_lock_file():
                 log_debug(f"Invalid lock file structure, ignoring: {self.lock_file_path}")
                 return False
+
+            # Apply journaled updates newer than the snapshot, then compact them into it
+            if self._replay_journal():
+                self._save_lock_file()
             
             # Check if lock file is stale (older than 24 hours)
             lock_time = datetime.datetime.fromisoformat(self.lock_data["timestamp"])
@@ -1450,32 +2613,160 @@ class TransferLockManager:
         if partial_hash:
             file_entry["partial_hash"] = partial_hash
 
-        # Buffer this update for batched saving
-        self._pending_updates[filename] = {
-            "status": status,
-            "transferred_bytes": transferred_bytes,
-            "partial_hash": partial_hash
-        }
+        # Batch by filename only; the flush reads the values back from lock_data
+        with self._dirty_lock:
+            self._dirty_files.add(filename)
+            pending = len(self._dirty_files)
+
+        if force_save:
+            self.flush_pending_updates()
+        # Save promptly for status transitions or when batch limits reached
+        elif (status == "completed" or
+              status == "failed" or
+              pending >= self._max_pending or
+              time.time() - self._last_save_time >= self._save_interval):
+            self._request_flush()
+
+    def get_file_entry(self, filename: str) -> Optional[Dict]:
+        """Get the live lock_data entry for filename, for use with update_bytes_fast()"""
+        if not self.lock_data:
+            return None
+        return self.lock_data["files"].get(filename)
 
-        # Save immediately for critical operations or when batch limits reached
-        current_time = time.time()
-        if (force_save or
-            status == "completed" or
-            status == "failed" or
-            len(self._pending_updates) >= self._max_pending or
-            current_time - self._last_save_time >= self._save_interval):
-            self._flush_pending_updates()
-    
-    def _flush_pending_updates(self):
-        """Save pending updates to lock file and clear buffer"""
-        if self._pending_updates:
-            self._save_lock_file()
-            self._pending_updates.clear()
-            self._last_save_time = time.time()
+    def update_bytes_fast(self, filename: str, file_entry: Dict, transferred_bytes: int):
+        """Record progress of an in-progress file (FileWriter's per-10MB hot path)
+
+        Skips the lookups and status branching of update_file_status(); status
+        transitions (pending, completed, failed) still go through that method.
+
+        Args:
+            filename: File being written
+            file_entry: Entry from get_file_entry(), cached by the caller
+            transferred_bytes: Bytes written so far
+        """
+        file_entry["status"] = "in_progress"
+        file_entry["transferred_bytes"] = transferred_bytes
+        with self._dirty_lock:
+            self._dirty_files.add(filename)
+            pending = len(self._dirty_files)
+        if (pending >= self._max_pending or
+                time.time() - self._last_save_time >= self._save_interval):
+            self._request_flush()
+
+    def _request_flush(self):
+        """Flush now, or hand the flush to the background flusher if running"""
+        if self._flusher is not None:
+            self._flush_wakeup.set()
+        else:
+            self.flush_pending_updates()
+
+    def start_background_flush(self):
+        """Move journal appends and their fsync onto a background thread
+
+        Until stop_background_flush(), batch limits only wake the flusher, and
+        it also flushes every save interval on its own, so the receive loop
+        never blocks on lock-file I/O.
+        """
+        if self._flusher is not None:
+            return
+        self._flusher_stop = False
+        self._flusher = threading.Thread(target=self._run_flusher, daemon=True)
+        self._flusher.start()
+
+    def stop_background_flush(self):
+        """Stop the background flusher, flushing whatever is still pending"""
+        flusher = self._flusher
+        if flusher is None:
+            return
+        self._flusher_stop = True
+        self._flush_wakeup.set()
+        flusher.join()
+        self._flusher = None
+        self.flush_pending_updates()
+
+    def _run_flusher(self):
+        while not self._flusher_stop:
+            self._flush_wakeup.wait(self._save_interval)
+            self._flush_wakeup.clear()
+            self.flush_pending_updates()
     
     def flush_pending_updates(self):
-        """Public method to force flush pending updates"""
-        self._flush_pending_updates()
+        """Append pending updates to the journal and clear buffer
+
+        Only the changed entries are written (one JSON line each), so the
+        cost no longer grows with the number of files in the transfer.
+        """
+        with self._dirty_lock:
+            if not (self._dirty_files and self.lock_data):
+                return
+            filenames, self._dirty_files = self._dirty_files, set()
+        with self._journal_lock:
+            if self.lock_data:
+                self._append_journal(filenames)
+        self._last_save_time = time.time()
+
+    def _append_journal(self, filenames):
+        """Append the current status of each named file to the journal and fsync"""
+        files = self.lock_data["files"]
+        try:
+            if self._journal is None:
+                self._journal = open(self._journal_path, 'ab')
+            self._journal.write(b''.join(
+                _json_dumps({
+                    "file": filename,
+                    "status": files[filename]["status"],
+                    "transferred_bytes": files[filename]["transferred_bytes"],
+                    "partial_hash": files[filename].get("partial_hash"),
+                    "final_path": files[filename].get("final_path"),
+                    "final_stat": files[filename].get("final_stat"),
+                }) + b'\n'
+                for filename in filenames
+            ))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except OSError as e:
+            log_debug(f"Failed to append to lock journal: {e}")
+
+    def _reset_journal(self):
+        """Start an empty journal tagged with the current snapshot generation"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with open(self._journal_path, 'wb') as f:
+            f.write(_json_dumps({"generation": self.lock_data["generation"]}) + b'\n')
+
+    def _replay_journal(self) -> bool:
+        """Apply journal deltas to lock_data. Returns True if any were applied."""
+        try:
+            with open(self._journal_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return False
+
+        applied = False
+        for index, line in enumerate(lines):
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                break  # Torn final line from an interrupted append
+            if index == 0:
+                # Deltas belong to exactly one snapshot; a journal left over from an
+                # older snapshot (crash between rename and reset) is already folded in
+                if entry.get("generation") != self.lock_data.get("generation"):
+                    return False
+                continue
+            file_entry = self.lock_data["files"].get(entry.get("file"))
+            if file_entry is None:
+                continue
+            file_entry["status"] = entry["status"]
+            file_entry["transferred_bytes"] = entry["transferred_bytes"]
+            if entry.get("partial_hash"):
+                file_entry["partial_hash"] = entry["partial_hash"]
+            if entry.get("final_stat"):
+                file_entry["final_path"] = entry["final_path"]
+                file_entry["final_stat"] = entry["final_stat"]
+            applied = True
+        return applied
 
     def enable_defer_mode(self):
         """Enable defer mode to buffer updates without writing to disk"""
@@ -1548,39 +2839,52 @@ class TransferLockManager:
         }
     
     def _save_lock_file(self):
-        """Save lock data to file"""
+        """Save a full snapshot of lock data to file and start a fresh journal"""
         if not self.lock_data:
             return
+        # Appends from the background flusher must not interleave with the swap
+        with self._journal_lock:
+            self.lock_data["generation"] = self.lock_data.get("generation", 0) + 1
 
-        try:
-            # Create parent directory if needed
-            self.lock_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write to temporary file first, then rename for atomicity
-            temp_path = self.lock_file_path.with_suffix('.tmp')
-            num_files = len(self.lock_data.get("files", {}))
-
-            # OPTIMIZATION: Use compact JSON for large transfers to reduce write time
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                if num_files > 1000:
-                    # Compact JSON - no indentation for large transfers
-                    json.dump(self.lock_data, f, separators=(',', ':'))
-                else:
-                    # Pretty JSON for small transfers (debugging friendly)
-                    json.dump(self.lock_data, f, indent=2)
+            try:
+                # Create parent directory if needed (it exists after the first save)
+                if not self._last_save_time:
+                    self.lock_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            temp_path.rename(self.lock_file_path)
+                # Write to temporary file first, then rename for atomicity
+                temp_path = self.lock_file_path.with_suffix('.tmp')
+                # OPTIMIZATION: Compact JSON straight to bytes (orjson when available)
+                temp_path.write_bytes(_json_dumps(self.lock_data))
 
-        except OSError as e:
-            log_debug(f"Failed to save lock file: {e}")
+                os.replace(temp_path, self.lock_file_path)
+                self._last_save_time = time.time()
+
+                # The snapshot now contains every journaled update
+                self._reset_journal()
+
+            except OSError as e:
+                log_debug(f"Failed to save lock file: {e}")
+    
     
     def cleanup_on_completion(self):
-        """Remove lock file after successful transfer"""
-        try:
-            if self.lock_file_path.exists():
-                self.lock_file_path.unlink()
-        except OSError as e:
-            log_debug(f"Failed to remove lock file: {e}")
+        """Remove lock file and journal after successful transfer"""
+        # Nothing left to persist; later status updates and flushes become no-ops
+        self.stop_background_flush()
+        # The receive loop may still be marking entries dirty
+        with self._dirty_lock:
+            self._dirty_files.clear()
+        # ...and an inline flush may be mid-append
+        with self._journal_lock:
+            self.lock_data = None
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        for path in (self.lock_file_path, self._journal_path):
+            try:
+                if path.exists():
+                    path.unlink()
+            except OSError as e:
+                log_debug(f"Failed to remove lock file {path}: {e}")
     
     def handle_stale_locks(self):
         """Clean up old lock files"""
@@ -1596,6 +2900,8 @@ class TransferLockManager:
                     
                     if age.total_seconds() > 24 * 3600:  # 24 hours
                         lock_file.unlink()
+                        if self._journal_path.exists():
+                            self._journal_path.unlink()
                         log_debug(f"Removed stale lock file: {lock_file}")
                 
                 except OSError:
@@ -1604,18 +2910,6 @@ class TransferLockManager:
         except OSError:
             pass  # Ignore errors during cleanup
     
-    def _calculate_file_hash(self, file_path: str) -> Optional[str]:
-        """Calculate SHA-256 hash of a file"""
-        try:
-            hasher = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(64 * 1024), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
-        except OSError as e:
-            log_debug(f"Failed to hash file {file_path}: {e}")
-            return None
-    
     def verify_source_files_unchanged(self, source_file_paths: Dict[str, str]) -> List[str]:
         """
         Verify that source files haven't changed since lock creation.
@@ -1625,19 +2919,17 @@ class TransferLockManager:
             return []
         
         changed_files = []
-        
-        for filename, file_path in source_file_paths.items():
-            if filename not in self.lock_data["files"]:
-                continue
-            
-            lock_info = self.lock_data["files"][filename]
-            original_hash = lock_info.get("original_hash")
-            
-            if not original_hash:
-                # No original hash stored, skip verification
-                continue
-            
-            current_hash = self._calculate_file_hash(file_path)
+
+        # Only files with a stored original hash can be verified
+        files = self.lock_data["files"]
+        to_verify = {
+            filename: file_path for filename, file_path in source_file_paths.items()
+            if filename in files and files[filename].get("original_hash")
+        }
+
+        for filename, current_hash in calculate_file_hashes(to_verify).items():
+            lock_info = files[filename]
+            original_hash = lock_info["original_hash"]
             if current_hash and current_hash != original_hash:
                 changed_files.append(filename)
                 # Update lock file to mark for fresh transfer
@@ -1656,62 +2948,142 @@ class TransferLockManager:
         if not self.lock_data:
             return
         
-        for filename, file_path in source_file_paths.items():
-            if filename in self.lock_data["files"]:
-                current_hash = self._calculate_file_hash(file_path)
-                if current_hash:
-                    self.lock_data["files"][filename]["original_hash"] = current_hash
-                    # Also update last_modified time
-                    try:
-                        stat = os.stat(file_path)
-                        self.lock_data["files"][filename]["last_modified"] = datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
-                    except OSError:
-                        pass
+        known_files = {
+            filename: file_path for filename, file_path in source_file_paths.items()
+            if filename in self.lock_data["files"]
+        }
+        for filename, current_hash in calculate_file_hashes(known_files).items():
+            if current_hash:
+                self.lock_data["files"][filename]["original_hash"] = current_hash
+                # Also update last_modified time
+                try:
+                    stat = os.stat(known_files[filename])
+                    self.lock_data["files"][filename]["last_modified"] = datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
+                except OSError:
+                    pass
         
         self._save_lock_file()
 
 
-def send_single_file(client_socket, crypto, file_path: str, relative_path: str, use_compression: bool = True) -> str:
-    """Send a single file and return its hash"""
-    hasher = hashlib.sha256()
-    file_size = os.path.getsize(file_path)
+def send_single_file(client_socket, crypto, file_path: str, relative_path: str, use_compression: bool = True,
+                     file_size: Optional[int] = None) -> str:
+    """Send a single file and return its hash
+
+    Args:
+        file_size: Exact number of bytes to put on the wire (the size announced
+            in the metadata); the file is cut off or zero-padded (unhashed) to
+            it, so the receiver's length-based framing stays aligned. Defaults
+            to the file's current size.
+    """
+    hasher = new_sha256()
+    if file_size is None:
+        file_size = os.path.getsize(file_path)
 
-    with open(file_path, 'rb') as f:
+    # One reusable read buffer: each frame is consumed (compressed or
+    # encrypted into a new object) before the next readinto() overwrites it
+    buffer = bytearray(CHUNK_SIZE)
+    buffer_view = memoryview(buffer)
+
+    with open(file_path, 'rb', buffering=0) as f:
+        advise_sequential(f)
         bytes_sent = 0
         while bytes_sent < file_size:
-            chunk = f.read(CHUNK_SIZE)
-            if not chunk:
-                break
-
-            # Update hash
-            hasher.update(chunk)
+            want = min(CHUNK_SIZE, file_size - bytes_sent)
+            count = f.readinto(buffer_view[:want])
+            if count:
+                chunk = buffer_view[:count]
+                # Update hash
+                hasher.update(chunk)
+            else:
+                # File shrank: pad the rest of its announced size with zeros
+                buffer_view[:want] = bytes(want)
+                chunk = buffer_view[:want]
 
             # Conditionally compress chunk
             if use_compression:
-                chunk_to_send = blosc.compress(chunk, cname=BLOSC_COMPRESSOR, clevel=BLOSC_LEVEL)
+                level = BLOSC_LEVEL if _looks_compressible(chunk) else 0
+                chunk_to_send = blosc.compress(chunk, typesize=BLOSC_TYPESIZE, clevel=level,
+                                               shuffle=BLOSC_SHUFFLE, cname=BLOSC_COMPRESSOR)
             else:
                 chunk_to_send = chunk
 
             # Encrypt chunk
-            nonce = secrets.token_bytes(12)
+            nonce = crypto.next_nonce()
             encrypted_chunk = crypto.encrypt(chunk_to_send, nonce)
             
             # Send encrypted chunk
-            client_socket.sendall(len(nonce).to_bytes(4, 'big'))
-            client_socket.sendall(nonce)
-            client_socket.sendall(len(encrypted_chunk).to_bytes(4, 'big'))
-            client_socket.sendall(encrypted_chunk)
+            send_frame(client_socket, nonce, encrypted_chunk)
             
             bytes_sent += len(chunk)
     
     return hasher.hexdigest()
 
 
+def send_retry_stream(client_socket, crypto, files: List[Tuple[str, str, int]], use_compression: bool):
+    """Resend files the receiver failed to verify
+
+    The retry stream carries the files' data back to back, in request order
+    and at their announced sizes, then the end marker, then one frame with
+    their hashes. The receiver splits the data by size (receive_retry_stream).
+
+    Args:
+        files: (relative_path, file_path, announced_size) per file, in request order
+    """
+    retry_file_hashes = {}
+    for relative_path, file_path, file_size in files:
+        safe_print(f"Resending: {relative_path}")
+        retry_file_hashes[relative_path] = send_single_file(
+            client_socket, crypto, file_path, relative_path, use_compression, file_size)
+    client_socket.sendall(END_MARKER)
+
+    hash_nonce = crypto.next_nonce()
+    send_frame(client_socket, hash_nonce, crypto.encrypt(_json_dumps(retry_file_hashes), hash_nonce))
+
+
+def receive_retry_stream(client_socket, crypto, writers: List['FileWriter'], is_compressed: bool) -> Dict[str, str]:
+    """Receive a retry stream (see send_retry_stream) into writers
+
+    Args:
+        writers: Writers reset and reopened for the requested files, in request order
+
+    Returns:
+        Expected hashes of the resent files, by relative path
+    """
+    decompress_buffer = DecompressBuffer() if is_compressed else None
+    pending_writers = iter(writers)
+    writer = next(pending_writers, None)
+
+    while True:
+        nonce_len_bytes = recv_all(client_socket, 4)
+        if nonce_len_bytes == END_MARKER:
+            break
+        nonce = recv_all(client_socket, _U32.unpack(nonce_len_bytes)[0])
+        encrypted_chunk = recv_all(client_socket, _U32.unpack(recv_all(client_socket, 4))[0])
+        decrypted_chunk = crypto.decrypt(encrypted_chunk, nonce)
+        chunk = decompress_buffer.decompress(decrypted_chunk) if is_compressed else decrypted_chunk
+
+        # Hand each file exactly its remaining bytes, in order
+        chunk_view = memoryview(chunk)
+        position = 0
+        while writer is not None and position < len(chunk_view):
+            take = min(writer.size - writer.written, len(chunk_view) - position)
+            writer.write_chunk(chunk_view[position:position + take])
+            position += take
+            if writer.written >= writer.size:
+                writer.complete_file()
+                writer = next(pending_writers, None)
+
+    hash_nonce = recv_all(client_socket, _U32.unpack(recv_all(client_socket, 4))[0])
+    encrypted_hashes = recv_all(client_socket, _U32.unpack(recv_all(client_socket, 4))[0])
+    return _json_loads(crypto.decrypt(encrypted_hashes, hash_nonce))
+
+
 def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool = False):
     """Sender mode: listen for connections and send files"""
     
     is_message = message_text is not None
     temp_dir = None
+    progress_future = None
     
     if is_message:
         # Create temporary directory for the message
@@ -1765,32 +3137,10 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
             
             if exclude_venv:
                 # Re-collect files excluding virtual environment directories
-                def collect_from_directory_filtered(base_path: Path, current_path: Path):
-                    filtered_files = []
-                    try:
-                        for item in current_path.iterdir():
-                            if item.is_file():
-                                relative_path = item.relative_to(base_path.parent)
-                                filtered_files.append((item, str(relative_path)))
-                            elif item.is_dir():
-                                # Check if this directory matches venv patterns
-                                if not (item.name.lower() in [pattern.lower() for pattern in VENV_PATTERNS]):
-                                    # Recursively process subdirectory
-                                    filtered_files.extend(collect_from_directory_filtered(base_path, item))
-                    except PermissionError:
-                        log_debug(f"Permission denied accessing {current_path}")
-                    return filtered_files
-                
-                # Rebuild collected_files excluding venv directories
-                collected_files = []
-                for path in files:
-                    if path.is_file():
-                        collected_files.append((path, path.name))
-                    elif path.is_dir():
-                        collected_files.extend(collect_from_directory_filtered(path, path))
+                collected_files, _ = collect_files_recursive(files, exclude_venv=True)
     else:
         # Regular files
-        collected_files = [(f, f.name) for f in files]
+        collected_files = [(f, f.name, f.stat().st_size) for f in files]
 
     # Ask user about compression
     if is_message:
@@ -1800,7 +3150,8 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         use_compression = response == 'y'
 
     # Calculate total size and prepare metadata for all files
-    total_size = sum(abs_path.stat().st_size for abs_path, _ in collected_files)
+    # Sizes were recorded during collection, so no second stat() per file
+    total_size = sum(size for _, _, size in collected_files)
     filename = f"{len(collected_files)}_files" if len(collected_files) > 1 else collected_files[0][1]
     
     # Check for potential resource issues
@@ -1817,17 +3168,18 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
     # Start server
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    tune_socket_buffers(server_socket, auto_pod_mode)
     server_socket.bind((bind_ip, TRANSFER_PORT))
     server_socket.listen(1)
     server_socket.settimeout(300)  # 5 minute timeout
+    client_socket = None
+    resend_source = ResendSource()  # Open file and buffer reused across RESEND requests
 
     safe_print("Waiting for receiver to connect... ", end="")
     
     try:
         client_socket, client_addr = server_socket.accept()
-
-        # Enable TCP_NODELAY for lower latency (disable Nagle's algorithm)
-        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        tune_connected_socket(client_socket, sending=True)
 
         # Validate client is from Tailscale network (skip for localhost in pod mode)
         if effective_pod_mode and client_addr[0] == "127.0.0.1":
@@ -1843,30 +3195,27 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         crypto = SecureCrypto()
         public_key_bytes = crypto.get_public_key_bytes()
         
-        # Send public key first
-        client_socket.sendall(len(public_key_bytes).to_bytes(4, 'big'))
-        client_socket.sendall(public_key_bytes)
+        # Send public key first, followed by our cipher preference
+        client_socket.sendall(_U32.pack(len(public_key_bytes)) + public_key_bytes + crypto.get_cipher_preference())
         
-        # Receive peer's public key
-        peer_key_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        # Receive peer's public key and cipher preference
+        peer_key_len = _U32.unpack(recv_all(client_socket, 4))[0]
         peer_public_key_bytes = recv_all(client_socket, peer_key_len)
+        peer_cipher_preference = recv_all(client_socket, 1)
         
         # Derive session key
-        crypto.derive_session_key(peer_public_key_bytes, token)
+        crypto.derive_session_key(peer_public_key_bytes, token, peer_cipher_preference)
         
         # Send authentication challenge
         challenge = secrets.token_bytes(32)
         expected_response = hashlib.sha256(challenge + token.encode()).digest()
         
-        nonce1 = secrets.token_bytes(12)
+        nonce1 = crypto.next_nonce()
         encrypted_challenge = crypto.encrypt(challenge, nonce1)
-        client_socket.sendall(len(nonce1).to_bytes(4, 'big'))
-        client_socket.sendall(nonce1)
-        client_socket.sendall(len(encrypted_challenge).to_bytes(4, 'big'))
-        client_socket.sendall(encrypted_challenge)
+        send_frame(client_socket, nonce1, encrypted_challenge)
         
         # Receive response
-        response_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        response_len = _U32.unpack(recv_all(client_socket, 4))[0]
         response = recv_all(client_socket, response_len)
 
         if response != expected_response:
@@ -1881,14 +3230,14 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         current_offset = 0
         
         # Prepare metadata for all files with offsets
-        for file_path, relative_path in collected_files:
-            file_size = file_path.stat().st_size
+        for file_path, relative_path, file_size in collected_files:
             files_metadata.append({
                 'filename': relative_path,
                 'size': file_size,
                 'offset': current_offset
             })
             current_offset += file_size
+        stream_offsets = build_stream_offsets(files_metadata)
         
         batch_metadata = {
             'type': 'stream',
@@ -1899,9 +3248,9 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
             'files': files_metadata,
             'is_message': is_message
         }
-        metadata_json = json.dumps(batch_metadata).encode()
+        metadata_json = _json_dumps(batch_metadata)
         
-        nonce_meta = secrets.token_bytes(12)
+        nonce_meta = crypto.next_nonce()
         encrypted_metadata = crypto.encrypt(metadata_json, nonce_meta)
 
         # DEBUG: Log metadata transmission details
@@ -1910,10 +3259,7 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         print(f"[DEBUG SENDER] Encrypted metadata size: {len(encrypted_metadata)} bytes")
         print(f"[DEBUG SENDER] Sending nonce_len: {len(nonce_meta)}")
 
-        client_socket.sendall(len(nonce_meta).to_bytes(4, 'big'))
-        client_socket.sendall(nonce_meta)
-        client_socket.sendall(len(encrypted_metadata).to_bytes(4, 'big'))
-        client_socket.sendall(encrypted_metadata)
+        send_frame(client_socket, nonce_meta, encrypted_metadata)
 
         print(f"[DEBUG SENDER] Metadata sent successfully")
 
@@ -1932,7 +3278,7 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
 
         client_socket.settimeout(timeout)
         try:
-            ready_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+            ready_len = _U32.unpack(recv_all(client_socket, 4))[0]
             ready_signal = recv_all(client_socket, ready_len)
             if ready_signal != b'READY':
                 safe_print("Error: Invalid receiver ready signal")
@@ -1947,7 +3293,7 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         client_socket.settimeout(300)
 
         # Stream all files using large buffer chunks
-        buffer_size = 1024 * 1024  # 1MB buffer for streaming
+        buffer_size = CHUNK_SIZE
         start_time = time.time()
 
         # RESEND detection tracking
@@ -1955,13 +3301,16 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         RESEND_CHECK_INTERVAL = 0.5  # Check every 500ms
         chunks_sent = 0
 
-        # Create streaming buffer and track progress
-        buffer = bytearray()
+        # Frames are filled in place by readinto() and handed to the send
+        # pipeline whole, so file data isn't copied between read and compress
+        frame = bytearray(buffer_size)
+        frame_view = memoryview(frame)
+        frame_fill = 0
         file_hashes = {}
         original_bytes_processed = 0  # Track original file bytes for progress
         total_bytes_sent = 0  # Track total compressed bytes sent over network
-        current_file_start = 0  # Track start position of current file
         buffer_stream_position = 0  # Track stream position of data being sent (for display sync)
+        display_file_end = 0  # Stream offset where the displayed file ends
 
         # Setup background progress thread
         progress_state = {
@@ -1971,129 +3320,117 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
             'total_size': total_size,
             'action': 'Sending',
             'start_time': start_time,
-            'files_metadata': files_metadata
+            'files_metadata': files_metadata,
+            'stream_offsets': stream_offsets,
+            'progress_cv': threading.Condition()
         }
         stop_progress = threading.Event()
-        progress_thread = threading.Thread(
-            target=progress_update_thread,
-            args=(progress_state, stop_progress),
-            daemon=True
-        )
-        progress_thread.start()
-
-        for file_path, relative_path in collected_files:
-            file_size = file_path.stat().st_size
-
-            # Read file, compress, and calculate hash of original data
-            hasher = hashlib.sha256()
-            file_bytes_processed = 0
+        progress_future = start_progress_thread(progress_state, stop_progress)
+
+        def on_frame_sent(plain_len, cipher_len):
+            """Per-frame bookkeeping, run on the send pipeline's thread"""
+            nonlocal total_bytes_sent, chunks_sent, buffer_stream_position, last_resend_check_time
+            nonlocal display_file_end
+
+            # Update progress display to show file being SENT (not read)
+            # This syncs sender display with receiver display; the lookup
+            # only reruns once the stream has moved past the file shown last
+            if buffer_stream_position >= display_file_end:
+                current_file_sending = get_current_file_info(buffer_stream_position, files_metadata, stream_offsets)
+                if current_file_sending:
+                    progress_state['filename'] = current_file_sending['filename']
+                    progress_state['file_size'] = current_file_sending['size']
+                    display_file_end = current_file_sending['offset'] + current_file_sending['size']
+
+            # Track total bytes sent over network
+            total_bytes_sent += cipher_len
+            chunks_sent += 1
+
+            # Increment buffer stream position (tracks where we are in sending)
+            buffer_stream_position += plain_len
+            progress_state['stream_position'] = buffer_stream_position
+            notify_progress(progress_state)
 
-            with open(file_path, 'rb') as f:
-                while True:
-                    chunk = f.read(64 * 1024)  # Read in 64KB chunks
-                    if not chunk:
+            # Periodically check for RESEND requests from receiver
+            current_time = time.time()
+            if current_time - last_resend_check_time >= RESEND_CHECK_INTERVAL:
+                last_resend_check_time = current_time
+
+                # Non-blocking check for a pending request
+                if resend_pending():
+                    # RESEND request available - handle it
+                    handle_resend_request(client_socket, crypto, collected_files, stream_offsets, use_compression,
+                                          resend_source)
+
+        resend_pending = make_readable_check(client_socket)
+
+        # Compression, encryption and sends run on pipeline threads while this
+        # thread keeps reading and hashing
+        send_pipeline = SendPipeline(client_socket, crypto, use_compression, on_frame_sent)
+
+        for file_path, relative_path, file_size in collected_files:
+            # Read file and calculate hash of original data
+            hasher = new_sha256()
+            # OPTIMIZATION: Hash this file's bytes once per frame (not per read),
+            # starting from where the file began in the current frame
+            hash_start = frame_fill
+
+            # Send exactly the size announced in the metadata, even if the file
+            # changed since collection, so the stream stays aligned with the offsets
+            remaining = file_size
+
+            with open(file_path, 'rb', buffering=0) as f:
+                advise_sequential(f)
+                while remaining:
+                    count = f.readinto(frame_view[frame_fill:frame_fill + min(FILE_READ_SIZE, remaining)])
+                    if not count:
                         break
-
-                    # Hash original data for integrity verification
-                    hasher.update(chunk)
-                    original_bytes_processed += len(chunk)
-                    file_bytes_processed += len(chunk)
-
-                    # Accumulate uncompressed chunks in buffer
-                    buffer.extend(chunk)
-
-                    # When buffer reaches target size, compress entire buffer and send
-                    while len(buffer) >= buffer_size:
-                        # Extract 1MB of data
-                        chunk_data = bytes(buffer[:buffer_size])
-                        buffer = buffer[buffer_size:]
-
-                        # Update progress display to show file being SENT (not read)
-                        # This syncs sender display with receiver display
-                        current_file_sending = get_current_file_info(buffer_stream_position, files_metadata)
-                        if current_file_sending:
-                            progress_state['filename'] = current_file_sending['filename']
-                            progress_state['file_size'] = current_file_sending['size']
-
-                        # Conditionally compress based on user choice
-                        if use_compression:
-                            chunk_to_send = blosc.compress(chunk_data, cname=BLOSC_COMPRESSOR, clevel=BLOSC_LEVEL)
-                        else:
-                            chunk_to_send = chunk_data
-
-                        # Encrypt and send
-                        nonce = secrets.token_bytes(12)
-                        encrypted_chunk = crypto.encrypt(chunk_to_send, nonce)
-
-                        client_socket.sendall(len(nonce).to_bytes(4, 'big'))
-                        client_socket.sendall(nonce)
-                        client_socket.sendall(len(encrypted_chunk).to_bytes(4, 'big'))
-                        client_socket.sendall(encrypted_chunk)
-
-                        # Track total bytes sent over network
-                        total_bytes_sent += len(encrypted_chunk)
-                        chunks_sent += 1
-
-                        # Increment buffer stream position (tracks where we are in sending)
-                        buffer_stream_position += len(chunk_data)
-                        progress_state['stream_position'] = buffer_stream_position
-
-                        # Periodically check for RESEND requests from receiver
-                        current_time = time.time()
-                        if current_time - last_resend_check_time >= RESEND_CHECK_INTERVAL:
-                            last_resend_check_time = current_time
-
-                            # Use select with 0 timeout to check if data available (non-blocking)
-                            readable, _, _ = select.select([client_socket], [], [], 0)
-                            if readable:
-                                # RESEND request available - handle it
-                                handle_resend_request(client_socket, crypto, collected_files, use_compression)
+                    remaining -= count
+                    frame_fill += count
+                    original_bytes_processed += count
+
+                    # When the frame is full, hash it and hand it to the pipeline
+                    if frame_fill == buffer_size:
+                        hasher.update(frame_view[hash_start:])
+                        send_pipeline.submit(frame)
+                        frame = bytearray(buffer_size)
+                        frame_view = memoryview(frame)
+                        frame_fill = hash_start = 0
 
                     # Update progress state (background thread will display it)
                     progress_state['bytes_transferred'] = original_bytes_processed
 
-            # Store file hash
+            # Hash the file's tail in the partial frame, then store the file hash
+            hasher.update(frame_view[hash_start:frame_fill])
             file_hashes[relative_path] = hasher.hexdigest()
-            current_file_start += file_size
-        
-        # Send remaining buffer if non-empty
-        if buffer:
-            # Update progress display for remaining data
-            current_file_sending = get_current_file_info(buffer_stream_position, files_metadata)
-            if current_file_sending:
-                progress_state['filename'] = current_file_sending['filename']
-                progress_state['file_size'] = current_file_sending['size']
-
-            # Conditionally compress remaining data
-            remaining_data = bytes(buffer)
-            if use_compression:
-                data_to_send = blosc.compress(remaining_data, cname=BLOSC_COMPRESSOR, clevel=BLOSC_LEVEL)
-            else:
-                data_to_send = remaining_data
-
-            nonce = secrets.token_bytes(12)
-            encrypted_chunk = crypto.encrypt(data_to_send, nonce)
 
-            client_socket.sendall(len(nonce).to_bytes(4, 'big'))
-            client_socket.sendall(nonce)
-            client_socket.sendall(len(encrypted_chunk).to_bytes(4, 'big'))
-            client_socket.sendall(encrypted_chunk)
-
-            total_bytes_sent += len(encrypted_chunk)
-            buffer_stream_position += len(remaining_data)
-            progress_state['stream_position'] = buffer_stream_position
+            if remaining:
+                # File shrank: zero-fill the rest of its slot (unhashed, so the
+                # receiver's verification flags it for retry)
+                log_debug(f"Sender: {relative_path} is {remaining} bytes shorter than collected, padding")
+                while remaining:
+                    count = min(remaining, buffer_size - frame_fill)
+                    frame_view[frame_fill:frame_fill + count] = bytes(count)
+                    remaining -= count
+                    frame_fill += count
+                    original_bytes_processed += count
+                    if frame_fill == buffer_size:
+                        send_pipeline.submit(frame)
+                        frame = bytearray(buffer_size)
+                        frame_view = memoryview(frame)
+                        frame_fill = 0
+        
+        # Send remaining partial frame if non-empty
+        if frame_fill:
+            send_pipeline.submit(frame_view[:frame_fill])
+        send_pipeline.finish()
         
         # Send file hashes for verification
-        hash_data = json.dumps(file_hashes).encode()
-        nonce_hash = secrets.token_bytes(12)
+        hash_data = _json_dumps(file_hashes)
+        nonce_hash = crypto.next_nonce()
         encrypted_hashes = crypto.encrypt(hash_data, nonce_hash)
-        client_socket.sendall(len(nonce_hash).to_bytes(4, 'big'))
-        client_socket.sendall(nonce_hash)
-        client_socket.sendall(len(encrypted_hashes).to_bytes(4, 'big'))
-        client_socket.sendall(encrypted_hashes)
-
-        # Send end marker
-        client_socket.sendall(b'\x00\x00\x00\x00')
+        # Send them together with the end marker
+        send_frame(client_socket, nonce_hash, encrypted_hashes, trailer=END_MARKER)
 
         # Log timing: sender finished sending all data
         data_send_time = time.time() - start_time
@@ -2105,24 +3442,25 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
         client_socket.settimeout(120)  # 120 second timeout for retry requests and completion
         completion_received = False
         completion_start_time = time.time()
+        relpath_to_path = None
 
         while True:
             try:
                 # Check for retry request or completion signal
                 nonce_len_bytes = client_socket.recv(4)
-                if not nonce_len_bytes or nonce_len_bytes == b'\x00\x00\x00\x00':
+                if not nonce_len_bytes or nonce_len_bytes == END_MARKER:
                     break
 
-                nonce_len = int.from_bytes(nonce_len_bytes, 'big')
+                nonce_len = _U32.unpack(nonce_len_bytes)[0]
                 nonce = recv_all(client_socket, nonce_len)
                 encrypted_len_bytes = recv_all(client_socket, 4)
-                encrypted_len = int.from_bytes(encrypted_len_bytes, 'big')
+                encrypted_len = _U32.unpack(encrypted_len_bytes)[0]
                 encrypted_data = recv_all(client_socket, encrypted_len)
 
                 # Decrypt the message
                 try:
                     decrypted_data = crypto.decrypt(encrypted_data, nonce)
-                    message = json.loads(decrypted_data.decode())
+                    message = _json_loads(decrypted_data)
 
                     # Check if it's a completion signal
                     if message.get("status") == "completed":
@@ -2143,28 +3481,16 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
                 safe_print(f"\nRetry attempt {attempt}: Resending {len(failed_files)} failed files...")
 
                 # Resend failed files
-                retry_file_hashes = {}
+                if relpath_to_path is None:
+                    # Built once, on the first retry, for O(1) lookups by relative path
+                    relpath_to_path = {relative_path: (file_path, file_size)
+                                       for file_path, relative_path, file_size in collected_files}
+                files_to_resend = []
                 for failed_filename in failed_files:
-                    if failed_filename in file_hashes:
-                        safe_print(f"Resending: {failed_filename}")
-                        
-                        # Find and resend the file from collected_files list
-                        for file_path, relative_path in collected_files:
-                            if relative_path == failed_filename:
-                                retry_file_hashes[failed_filename] = send_single_file(client_socket, crypto, file_path, failed_filename, use_compression)
-                                break
-                
-                # Send retry file hashes
-                retry_hash_data = json.dumps(retry_file_hashes).encode()
-                retry_nonce_hash = secrets.token_bytes(12)
-                retry_encrypted_hashes = crypto.encrypt(retry_hash_data, retry_nonce_hash)
-                client_socket.sendall(len(retry_nonce_hash).to_bytes(4, 'big'))
-                client_socket.sendall(retry_nonce_hash)
-                client_socket.sendall(len(retry_encrypted_hashes).to_bytes(4, 'big'))
-                client_socket.sendall(retry_encrypted_hashes)
-                
-                # Send retry end marker
-                client_socket.sendall(b'\x00\x00\x00\x00')
+                    file_path, file_size = relpath_to_path.get(failed_filename, (None, 0))
+                    if failed_filename in file_hashes and file_path is not None:
+                        files_to_resend.append((failed_filename, file_path, file_size))
+                send_retry_stream(client_socket, crypto, files_to_resend, use_compression)
 
                 safe_print(f"Retry attempt {attempt} completed")
             except socket.timeout:
@@ -2188,8 +3514,7 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
                 break
 
         # Stop progress thread
-        stop_progress.set()
-        progress_thread.join(timeout=1.0)
+        stop_progress_thread(progress_state, stop_progress, progress_future)
 
         # Calculate and show completion
         total_time = time.time() - start_time
@@ -2243,6 +3568,9 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
     except KeyboardInterrupt:
         safe_print("\nTransfer interrupted by user")
     finally:
+        # Close the file kept open for RESEND requests
+        resend_source.close()
+
         # Cleanup temporary directory if it was created
         if temp_dir and os.path.exists(temp_dir):
             try:
@@ -2250,21 +3578,40 @@ def send_files(file_paths: List[str] = None, message_text: str = None, pod: bool
             except OSError:
                 pass
 
-        # Stop progress thread if it exists
-        if 'stop_progress' in locals():
-            stop_progress.set()
-        if 'progress_thread' in locals():
-            progress_thread.join(timeout=1.0)
+        # Stop progress thread if it was started
+        if progress_future is not None:
+            stop_progress_thread(progress_state, stop_progress, progress_future)
 
         # Gracefully shutdown sockets before closing
-        try:
-            if 'client_socket' in locals():
-                client_socket.shutdown(socket.SHUT_RDWR)
-        except (OSError, AttributeError):
-            pass  # Socket may already be closed
+        if client_socket is not None:
+            close_socket_gracefully(client_socket)
         server_socket.close()
 
 
+# Receiver error explanations, each written with a single print() call
+_RECEIVE_ERROR_DETAILS = {
+    'too_many_files': (
+        "Error: Too many open files - system file descriptor limit exceeded\n"
+        "This typically happens with very large numbers of files.\n"
+        "The transfer uses lazy file opening, but system limits were still exceeded.\n"
+        "Try transferring fewer files at once or increase system limits."),
+    'no_space': (
+        "Error: No space left on device\n"
+        "The receiving device has run out of disk space."),
+    'decompress': (
+        "This indicates corrupted compressed data or protocol mismatch.\n"
+        "The sender may have sent hash data that was incorrectly processed as file data."),
+    'json': "This may indicate network corruption or protocol issues.",
+    'decrypt': (
+        "Error: Data decryption failed (possible data corruption, network issue, or protocol mismatch)\n"
+        "This is NOT an authentication issue - authentication succeeded."),
+}
+_RECOVERY_SUGGESTIONS = (
+    "\nRecovery suggestions:\n"
+    "1. Retry the transfer if partial files exist (automatic resume will be attempted)\n"
+    "2. Try transferring fewer files at once\n"
+    "3. Check network connectivity and stability")
+
 def receive_files(connection_string: str, output_dir: str = '.', pod: bool = False):
     """Receiver mode: connect to sender and receive files"""
     
@@ -2311,35 +3658,36 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
     
     # Connect to sender
     client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    tune_socket_buffers(client_socket, auto_pod_mode)
     client_socket.settimeout(30)  # 30 second timeout
+    progress_future = None
+    abort_connection = False  # Set on corruption errors: tear down without draining
     
     try:
         print("[ftransfer v1.0.1]")
         print("Connecting to sender... ", end="")
         client_socket.connect((ip, TRANSFER_PORT))
-
-        # Enable TCP_NODELAY for lower latency (disable Nagle's algorithm)
-        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        tune_connected_socket(client_socket, sending=False)
 
         # Perform secure handshake
         crypto = SecureCrypto()
         public_key_bytes = crypto.get_public_key_bytes()
         
-        # Receive sender's public key
-        sender_key_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        # Receive sender's public key and cipher preference
+        sender_key_len = _U32.unpack(recv_all(client_socket, 4))[0]
         sender_public_key = recv_all(client_socket, sender_key_len)
+        sender_cipher_preference = recv_all(client_socket, 1)
         
-        # Send our public key
-        client_socket.sendall(len(public_key_bytes).to_bytes(4, 'big'))
-        client_socket.sendall(public_key_bytes)
+        # Send our public key, followed by our cipher preference
+        client_socket.sendall(_U32.pack(len(public_key_bytes)) + public_key_bytes + crypto.get_cipher_preference())
         
         # Derive session key
-        crypto.derive_session_key(sender_public_key, token)
+        crypto.derive_session_key(sender_public_key, token, sender_cipher_preference)
         
         # Receive and respond to authentication challenge
-        nonce_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        nonce_len = _U32.unpack(recv_all(client_socket, 4))[0]
         nonce = recv_all(client_socket, nonce_len)
-        challenge_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        challenge_len = _U32.unpack(recv_all(client_socket, 4))[0]
         encrypted_challenge = recv_all(client_socket, challenge_len)
         
         # Decrypt challenge
@@ -2347,14 +3695,13 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         
         # Generate and send response
         response = hashlib.sha256(challenge + token.encode()).digest()
-        client_socket.sendall(len(response).to_bytes(4, 'big'))
-        client_socket.sendall(response)
+        client_socket.sendall(_U32.pack(len(response)) + response)
         
         print("Authentication successful")
         
         # Receive file metadata
         print("[DEBUG RECEIVER] Receiving metadata nonce length...")
-        meta_nonce_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        meta_nonce_len = _U32.unpack(recv_all(client_socket, 4))[0]
         print(f"[DEBUG RECEIVER] Nonce length received: {meta_nonce_len} (expected: 12)")
 
         print(f"[DEBUG RECEIVER] Receiving nonce ({meta_nonce_len} bytes)...")
@@ -2362,7 +3709,7 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         print(f"[DEBUG RECEIVER] Nonce received: {len(meta_nonce)} bytes")
 
         print("[DEBUG RECEIVER] Receiving encrypted metadata length...")
-        meta_len = int.from_bytes(recv_all(client_socket, 4), 'big')
+        meta_len = _U32.unpack(recv_all(client_socket, 4))[0]
         print(f"[DEBUG RECEIVER] Encrypted metadata length: {meta_len} bytes")
 
         print(f"[DEBUG RECEIVER] Receiving encrypted metadata ({meta_len} bytes)...")
@@ -2372,7 +3719,7 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         print("[DEBUG RECEIVER] Attempting to decrypt metadata...")
         metadata_json = crypto.decrypt(encrypted_metadata, meta_nonce)
         print(f"[DEBUG RECEIVER] Metadata decrypted successfully: {len(metadata_json)} bytes")
-        metadata = json.loads(metadata_json.decode())
+        metadata = _json_loads(metadata_json)
         
         # Handle new streaming protocol
         if metadata.get('type') != 'stream':
@@ -2382,6 +3729,7 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         file_count = metadata['file_count']
         total_size = metadata['total_size']
         files_info = metadata['files']
+        stream_offsets = build_stream_offsets(files_info)
         is_compressed = metadata.get('compressed', False)
         compressor = metadata.get('compressor', 'none')
         is_message = metadata.get('is_message', False)
@@ -2478,8 +3826,7 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
 
         # Send RECEIVER_READY signal to sender after setup is complete
         ready_signal = b'READY'
-        client_socket.sendall(len(ready_signal).to_bytes(4, 'big'))
-        client_socket.sendall(ready_signal)
+        client_socket.sendall(_U32.pack(len(ready_signal)) + ready_signal)
 
         # Use 5 minute timeout to detect true stalls (instead of infinite blocking)
         client_socket.settimeout(300)
@@ -2487,7 +3834,6 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         # Receive streaming data with incremental saving
         stream_position = 0  # Tracks uncompressed data position in the stream
         total_bytes_received = 0  # Tracks compressed bytes received from network
-        total_compressed_bytes_received = 0  # Tracks actual compressed data received
         start_time = time.time()
 
         # OPTIMIZATION: Setup background progress thread with real initial data
@@ -2504,7 +3850,9 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
             'last_update_bytes': 0,
             'warmup_period': True,  # Use cumulative speed for first 5 seconds
             'stream_position': 0,  # Track position for stall recovery
-            'files_metadata': files_info
+            'files_metadata': files_info,
+            'stream_offsets': stream_offsets,
+            'progress_cv': threading.Condition()
         }
 
         # Setup stall detection and recovery
@@ -2522,16 +3870,17 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
                 stop_progress.set()
 
         stop_progress = threading.Event()
-        progress_thread = threading.Thread(
-            target=progress_update_thread,
-            args=(progress_state, stop_progress, None),  # Disable RESEND mechanism to prevent deadlock
-            daemon=True
-        )
-        progress_thread.start()
-
+        # Stall callback disabled: the RESEND mechanism could deadlock
+        progress_future = start_progress_thread(progress_state, stop_progress)
+
+        # OPTIMIZATION: Journal appends and fsyncs happen off the receive loop
+        lock_manager.start_background_flush()
+        receive_pipeline = ReceivePipeline(client_socket, crypto,
+                                           compressed_size=uncompressed_total if is_compressed else None)
+        display_file_end = 0  # Stream offset where the displayed file ends
         try:
             # Receive all streaming data chunks
-            while True:
+            for _, decrypted_data in receive_pipeline:
                 # Check if stall event is set (triggered by progress thread)
                 if stall_event.is_set():
                     stall_event.clear()
@@ -2541,83 +3890,18 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
                     progress_state['stall_recovery_in_progress'] = False
                     log_debug(f"Receiver: Sent RESEND request #{resend_count['value']} for position {current_position}")
 
-                # Check for hashes marker (indicates data stream is complete)
-                nonce_len_bytes = recv_all(client_socket, 4)
-                if nonce_len_bytes == b'\x00\x00\x00\x00':
-                    break
-                    
-                nonce_len = int.from_bytes(nonce_len_bytes, 'big')
-                chunk_nonce = recv_all(client_socket, nonce_len)
-                chunk_len = int.from_bytes(recv_all(client_socket, 4), 'big')
-                encrypted_chunk = recv_all(client_socket, chunk_len)
-                
-                # Decrypt the chunk
-                decrypted_data = crypto.decrypt(encrypted_chunk, chunk_nonce)
-                
-                # Track compressed data received (for determining when we're done with file data)
-                total_compressed_bytes_received += len(encrypted_chunk)
-                
-                # More robust hash data detection
-                is_hash_data = False
-                
-                # Try to detect if this chunk is hash data (always uncompressed JSON)
-                try:
-                    potential_hash = json.loads(decrypted_data.decode('utf-8'))
-                    if isinstance(potential_hash, dict) and all(isinstance(k, str) for k in potential_hash.keys()):
-                        # This looks like hash data (dictionary with string keys)
-                        file_hashes = potential_hash
-                        is_hash_data = True
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    # Not JSON, must be compressed file data
-                    pass
-                
-                # If not hash data, process as file data
-                if not is_hash_data:
-                    # Decompress if needed
-                    if is_compressed:
-                        try:
-                            chunk = blosc.decompress(decrypted_data)
-                        except Exception as e:
-                            # If decompression fails, this might be hash data incorrectly detected as file data
-                            if 'blosc_extension.error' in str(type(e)):
-                                try:
-                                    # Try to parse as hash data
-                                    potential_hash = json.loads(decrypted_data.decode('utf-8'))
-                                    if isinstance(potential_hash, dict) and all(isinstance(k, str) for k in potential_hash.keys()):
-                                        # This looks like file hash data (string keys)
-                                        file_hashes = potential_hash
-                                        is_hash_data = True
-                                        print(f"\nDetected hash data after decompression failure (compressed data tracking: {total_compressed_bytes_received}/{total_size} bytes)")
-                                    else:
-                                        raise e  # Re-raise if not valid hash data
-                                except (json.JSONDecodeError, UnicodeDecodeError):
-                                    print(f"\nDecompression failed and data is not valid JSON. Compressed bytes received: {total_compressed_bytes_received}/{total_size}")
-                                    raise e  # Re-raise original decompression error
-                            else:
-                                raise e
-                    else:
-                        chunk = decrypted_data
-                
-                # If this was hash data, we're done with file data
-                if is_hash_data:
+                # The data frames carry exactly uncompressed_total bytes, so the
+                # first frame past that point is the hashes frame (no need to
+                # speculatively parse every frame as JSON)
+                if stream_position >= uncompressed_total:
+                    file_hashes = _json_loads(decrypted_data)
                     break
-                
-                # Write to appropriate files incrementally
-                chunk_offset = 0
-                while chunk_offset < len(chunk):
-                    remaining_chunk = chunk[chunk_offset:]
-                    bytes_written = 0
-
-                    # Find which file needs data at this stream position (O(N) but no writer creation)
-                    writer = file_writers.get_writer_at_offset(stream_position + chunk_offset)
-                    if writer and writer.needs_data(stream_position + chunk_offset):
-                        bytes_written = writer.write_chunk(remaining_chunk)
-
-                    if bytes_written == 0:
-                        # No file needed this data, advance position
-                        chunk_offset = len(chunk)
-                    else:
-                        chunk_offset += bytes_written
+
+                # Compressed frames arrive already decompressed by the pipeline
+                chunk = decrypted_data
+
+                # Scatter the chunk across the files it covers (one lookup per chunk)
+                file_writers.write_range(stream_position, chunk)
                 
                 stream_position += len(chunk)
                 total_bytes_received += len(chunk)
@@ -2625,20 +3909,30 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
                 # Update progress state (background thread will display it)
                 progress_state['bytes_transferred'] = total_bytes_received
                 progress_state['stream_position'] = stream_position  # For stall recovery
-
-                # Update current filename for display
-                current_file = get_current_file_info(stream_position, files_info)
-                if current_file:
-                    progress_state['filename'] = current_file['filename']
-                    progress_state['file_size'] = current_file['size']
-                else:
-                    progress_state['filename'] = 'multiple files'
-                    progress_state['file_size'] = total_size
+                notify_progress(progress_state)
+
+                # Update current filename for display, looking it up again only
+                # once the stream has moved past the file shown last
+                if stream_position >= display_file_end:
+                    current_file = get_current_file_info(stream_position, files_info, stream_offsets)
+                    if current_file:
+                        progress_state['filename'] = current_file['filename']
+                        progress_state['file_size'] = current_file['size']
+                        display_file_end = current_file['offset'] + current_file['size']
+                    else:
+                        progress_state['filename'] = 'multiple files'
+                        progress_state['file_size'] = total_size
+                        display_file_end = float('inf')
         
+            # Consume the end marker that follows the hashes frame
+            receive_pipeline.finish()
         finally:
+            # Stop the pipeline threads even when the loop above raised
+            receive_pipeline.close()
             # Always close file handles (only created writers)
             for writer in file_writers.values():
                 writer.close()
+            lock_manager.stop_background_flush()
 
         # Log timing: receiver finished receiving all data
         data_receive_time = time.time() - start_time
@@ -2656,6 +3950,20 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         failed_files = []
         total_files = len(created_writers)
 
+        # Files finished by an earlier session streamed nothing into their
+        # hashers this time: reuse the hash recorded at completion if the file
+        # is untouched since, else hash it from disk, in parallel across cores
+        disk_hashes = {}
+        to_rehash = {}
+        for writer in created_writers:
+            if writer.completed_earlier and writer.filename in file_hashes:
+                recorded = writer.recorded_hash()
+                if recorded:
+                    disk_hashes[writer.filename] = recorded
+                else:
+                    to_rehash[writer.filename] = writer.final_path
+        disk_hashes.update(calculate_file_hashes(to_rehash))
+
         for idx, writer in enumerate(created_writers, 1):
             # Display verification progress every 10 files or on first/last file
             if idx == 1 or idx == total_files or idx % 10 == 0:
@@ -2669,7 +3977,10 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
             # Verify file integrity
             expected_hash = file_hashes.get(writer.filename)
             if expected_hash:
-                received_hash = writer.get_hash()
+                if writer.completed_earlier:
+                    received_hash = disk_hashes.get(writer.filename)
+                else:
+                    received_hash = writer.get_hash()
                 if received_hash != expected_hash:
                     failed_files.append({
                         'filename': writer.filename,
@@ -2679,24 +3990,12 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
                     })
                     continue  # Skip adding to received_files
             
-            # Add to received files list (FileWriter handles final naming)
-            final_path = Path(writer.filename)
-            if final_path.exists():
-                received_files.append(final_path)
+            # Add to received files list; complete_file() recorded where the data
+            # landed (renamed on conflict), so no need to probe candidate names
+            if writer.final_path is not None:
+                received_files.append(writer.final_path)
             else:
-                # Check for renamed file due to conflicts
-                counter = 1
-                while True:
-                    parent_dir = final_path.parent
-                    name_parts = final_path.stem, counter, final_path.suffix
-                    renamed_path = parent_dir / f"{name_parts[0]}_{name_parts[1]}{name_parts[2]}"
-                    if renamed_path.exists():
-                        received_files.append(renamed_path)
-                        break
-                    counter += 1
-                    if counter > 100:  # Prevent infinite loop
-                        log_debug(f"Could not locate final file for {writer.filename}")
-                        break
+                log_debug(f"Could not locate final file for {writer.filename}")
 
         # Clear verification progress line
         print("\r" + " " * 100 + "\r", end='', flush=True)
@@ -2734,20 +4033,17 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
             
             print(f"\nRetry attempt {retry_attempt}: Requesting resend of {len(failed_files)} failed files...")
             
-            retry_request = json.dumps({
+            retry_request = _json_dumps({
                 'type': 'retry_request',
                 'failed_files': failed_filenames,
                 'attempt': retry_attempt
-            }).encode()
+            })
 
             # Encrypt and send retry request
-            retry_nonce = secrets.token_bytes(12)
+            retry_nonce = crypto.next_nonce()
             encrypted_retry = crypto.encrypt(retry_request, retry_nonce)
 
-            client_socket.sendall(len(retry_nonce).to_bytes(4, 'big'))
-            client_socket.sendall(retry_nonce)
-            client_socket.sendall(len(encrypted_retry).to_bytes(4, 'big'))
-            client_socket.sendall(encrypted_retry)
+            send_frame(client_socket, retry_nonce, encrypted_retry)
             
             # Reset failed file writers for retry
             for failed_file in failed_files:
@@ -2759,71 +4055,8 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
             # Receive retry data using existing streaming protocol
             print("Receiving retry files...")
             
-            # Process retry stream similar to main transfer
-            compressed_bytes_received = 0
-            
-            while True:
-                try:
-                    # Receive chunk
-                    nonce_len_bytes = recv_all(client_socket, 4)
-                    if nonce_len_bytes == b'\x00\x00\x00\x00':
-                        break
-                    
-                    nonce_len = int.from_bytes(nonce_len_bytes, 'big')
-                    nonce = recv_all(client_socket, nonce_len)
-                    chunk_len = int.from_bytes(recv_all(client_socket, 4), 'big')
-                    encrypted_chunk = recv_all(client_socket, chunk_len)
-                    
-                    # Decrypt chunk
-                    compressed_chunk = crypto.decrypt(encrypted_chunk, nonce)
-                    compressed_bytes_received += len(compressed_chunk)
-                    
-                    # Check if this might be hash data instead of file data
-                    if compressed_bytes_received > total_size:
-                        # This is likely hash data - decrypt and parse
-                        try:
-                            hash_data = crypto.decrypt(encrypted_chunk, nonce)
-                            retry_file_hashes = json.loads(hash_data.decode())
-                            # Update file_hashes with retry hashes
-                            file_hashes.update(retry_file_hashes)
-                            break
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            # Not hash data, continue as file data
-                            pass
-                    
-                    # Decompress chunk
-                    chunk = blosc.decompress(compressed_chunk)
-                    
-                    # Write chunk to appropriate failed file writers only
-                    current_position = 0
-                    for failed_file in failed_files:
-                        writer = failed_file['writer']
-                        if not writer.is_complete:
-                            file_info = next(f for f in files_info if f['filename'] == writer.filename)
-                            file_size = file_info['size']
-                            
-                            bytes_needed = file_size - writer.written
-                            bytes_to_write = min(bytes_needed, len(chunk) - current_position)
-                            
-                            if bytes_to_write > 0:
-                                writer.write(chunk[current_position:current_position + bytes_to_write])
-                                current_position += bytes_to_write
-                                
-                                if writer.written >= file_size:
-                                    writer.complete_file()
-                                    
-                except Exception as e:
-                    if 'blosc_extension.error' in str(type(e)):
-                        # This might be hash data
-                        try:
-                            hash_data = crypto.decrypt(encrypted_chunk, nonce)
-                            retry_file_hashes = json.loads(hash_data.decode())
-                            file_hashes.update(retry_file_hashes)
-                            break
-                        except:
-                            pass
-                    else:
-                        break
+            file_hashes.update(receive_retry_stream(
+                client_socket, crypto, [failed_file['writer'] for failed_file in failed_files], is_compressed))
             
             print(f"Retry attempt {retry_attempt} completed. Verifying integrity...")
             
@@ -2863,18 +4096,15 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         completion_sent = False
         for attempt in range(3):  # Try up to 3 times
             try:
-                completion_signal = json.dumps({
+                completion_signal = _json_dumps({
                     "status": "completed",
                     "message": "Transfer successful",
                     "completion_time": time.time()
-                }).encode()
-                completion_nonce = secrets.token_bytes(12)
+                })
+                completion_nonce = crypto.next_nonce()
                 encrypted_completion = crypto.encrypt(completion_signal, completion_nonce)
 
-                client_socket.sendall(len(completion_nonce).to_bytes(4, 'big'))
-                client_socket.sendall(completion_nonce)
-                client_socket.sendall(len(encrypted_completion).to_bytes(4, 'big'))
-                client_socket.sendall(encrypted_completion)
+                send_frame(client_socket, completion_nonce, encrypted_completion)
 
                 # Use shutdown to ensure data is flushed before close
                 try:
@@ -2898,8 +4128,7 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
             log_debug("Receiver: Failed to send completion signal after 3 attempts")
 
         # Stop progress thread
-        stop_progress.set()
-        progress_thread.join(timeout=1.0)
+        stop_progress_thread(progress_state, stop_progress, progress_future)
 
         log_debug(f"Receiver: Transfer complete (total time: {total_time:.1f}s)")
         
@@ -2923,13 +4152,9 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
         sys.exit(1)
     except OSError as e:
         if e.errno == 24:  # "Too many open files"
-            print("Error: Too many open files - system file descriptor limit exceeded")
-            print("This typically happens with very large numbers of files.")
-            print("The transfer uses lazy file opening, but system limits were still exceeded.")
-            print("Try transferring fewer files at once or increase system limits.")
+            print(_RECEIVE_ERROR_DETAILS['too_many_files'])
         elif e.errno == 28:  # "No space left on device"
-            print("Error: No space left on device")
-            print("The receiving device has run out of disk space.")
+            print(_RECEIVE_ERROR_DETAILS['no_space'])
         else:
             print(f"Error: System error during transfer: {e}")
         
@@ -2949,27 +4174,22 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
     except Exception as e:
         # Handle blosc decompression errors specifically
         if 'blosc_extension.error' in str(type(e)):
-            print(f"Error: Data decompression failed: {e}")
-            print("This indicates corrupted compressed data or protocol mismatch.")
-            print("The sender may have sent hash data that was incorrectly processed as file data.")
+            abort_connection = True
+            print(f"Error: Data decompression failed: {e}\n{_RECEIVE_ERROR_DETAILS['decompress']}")
         elif isinstance(e, json.JSONDecodeError):
-            print(f"Error: JSON decoding failed: {e}")
-            print("This may indicate network corruption or protocol issues.")
-        elif 'InvalidTag' in str(type(e)) or type(e).__name__ == 'InvalidTag':
-            print("Error: Data decryption failed (possible data corruption, network issue, or protocol mismatch)")
-            print("This is NOT an authentication issue - authentication succeeded.")
+            print(f"Error: JSON decoding failed: {e}\n{_RECEIVE_ERROR_DETAILS['json']}")
+        elif isinstance(e, InvalidTag):
+            abort_connection = True
+            print(_RECEIVE_ERROR_DETAILS['decrypt'])
             sys.exit(1)
         else:
-            print(f"Error during transfer: {e}")
-            print(f"Error type: {type(e).__name__}")
+            details = f"Error during transfer: {e}\nError type: {type(e).__name__}"
             if hasattr(e, 'errno'):
-                print(f"Error code: {e.errno}")
+                details += f"\nError code: {e.errno}"
+            print(details)
         
         # Provide recovery suggestions
-        print("\nRecovery suggestions:")
-        print("1. Retry the transfer if partial files exist (automatic resume will be attempted)")
-        print("2. Try transferring fewer files at once")
-        print("3. Check network connectivity and stability")
+        print(_RECOVERY_SUGGESTIONS)
         sys.exit(1)
     except KeyboardInterrupt:
         print("\nTransfer interrupted by user")
@@ -2984,21 +4204,20 @@ def receive_files(connection_string: str, output_dir: str = '.', pod: bool = Fal
             print(f"Error code: {e.errno}")
         sys.exit(1)
     finally:
-        # Stop progress thread if it exists
-        if 'stop_progress' in locals():
-            stop_progress.set()
-        if 'progress_thread' in locals():
-            progress_thread.join(timeout=1.0)
+        # Stop progress thread if it was started
+        if progress_future is not None:
+            stop_progress_thread(progress_state, stop_progress, progress_future)
 
-        # Gracefully shutdown socket before closing
-        try:
-            client_socket.shutdown(socket.SHUT_RDWR)
-        except (OSError, AttributeError):
-            pass  # Socket may already be closed or shutdown
-        client_socket.close()
+        # The stream is unusable after corruption, so skip the drain and reset it
+        if abort_connection:
+            abort_socket(client_socket)
+        else:
+            close_socket_gracefully(client_socket)
 
 
-def main():
+@functools.lru_cache(maxsize=None)
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser once per process (reused by later main() calls)"""
     parser = argparse.ArgumentParser(
         description="Secure file transfer over Tailscale networks"
     )
@@ -3016,12 +4235,17 @@ def main():
     receive_parser.add_argument('-o', '--output-dir', default='.', help='Output directory for received files (default: current directory)')
     receive_parser.add_argument('--pod', action='store_true', help='Accept connections from localhost (127.0.0.1) for containerized environments')
     receive_parser.add_argument('--debug', action='store_true', help='Enable debug output (shows detailed diagnostic messages)')
-    
+    return parser
+
+
+def main():
+    parser = build_arg_parser()
     args = parser.parse_args()
 
     # Activate debug mode if requested
     if hasattr(args, 'debug') and args.debug:
-        # Set console handler to DEBUG level to show all messages
+        # Set logger and console handler to DEBUG level to show all messages
+        logger.setLevel(logging.DEBUG)
         for handler in logger.handlers:
             if isinstance(handler, logging.StreamHandler):
                 handler.setLevel(logging.DEBUG)